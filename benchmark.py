@@ -0,0 +1,307 @@
+"""Rendering benchmark of the dashboard. It times the full frame and each painter function \
+of the dashboard separately, for a sweep of dashboard sizes, speedometer ranges and painter \
+render hint sets, and reports p50/p95/p99 times in milliseconds. \n
+Usage: \n
+    python benchmark.py                              (full sweep, table output)
+    python benchmark.py --output results.json        (also save machine readable results)
+    python benchmark.py --compare results.json       (exit code 1 if p50 got slower than --threshold)
+    python benchmark.py --sizes 1280x720 --ranges 200 --hints all --iterations 100
+    python benchmark.py --needle-sprites                 (hands drawn from pre rendered pixmaps)
+    python benchmark.py --startup                        (import time and time to first painted screen)
+    python benchmark.py --fleet                          (FleetWall frame with every one of 500 tiles changed)
+    python benchmark.py --check-needle-reset             (exit code 1 if the speed needle does not return to 0)
+note: runs on the offscreen platform unless QT_QPA_PLATFORM is set, so no display is needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+
+import dashboard
+
+SIZES = ((480, 270), (960, 540), (1280, 720), (1920, 1080), (2560, 1440), (3840, 2160))
+RANGES = (40, 120, 200, 280, 400)
+RENDER_HINT_SETS = {
+    "all": dashboard._RENDER_HINTS,
+    "antialiasing": QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing,
+    "none": QPainter.RenderHints(),
+}
+PAINTERS = ("header_painting", "indicators_painting", "horn_painting", "charge_painting", "break_painting",
+            "accelerator_painting", "speedometer_painting", "battery_indicator_painting")
+FLEET_VEHICLES = 500
+# state with every indicator drawn in its active color
+STATE = {"speed": 0, "battery": 50, "accelerator_state": 1, "break_state": 1, "horn_state": 1, "charge_state": 1}
+
+
+def percentiles(samples: list) -> dict:
+    """p50, p95, p99, mean and max of samples in nanoseconds, as milliseconds"""
+    samples = sorted(samples)
+    def nearest_rank(p):
+        return samples[min(len(samples)-1, max(0, round(p/100*len(samples))-1))]/1e6
+    return {"p50": nearest_rank(50), "p95": nearest_rank(95), "p99": nearest_rank(99),
+            "mean": sum(samples)/len(samples)/1e6, "max": samples[-1]/1e6}
+
+
+def build_dashboard(width: int, height: int, top_speed: int, hints, needle_sprites: bool = False):
+    design = dashboard._DashBoardContolsDesign(size=QSize(width, height))
+    design.set_needle_sprites(needle_sprites, 64)
+    design.set_speedometer_resetter_state(False)
+    design.skip_start_up_animation()
+    design.render_hints = hints
+    design.set_speedometer_range(top_speed)
+    design.apply_state({**STATE, "speed": top_speed//2})
+    design.speed_motion_timer.stop()
+    design.show_time = 1
+    return design
+
+
+def time_frames(design, iterations: int) -> tuple:
+    """Returns first frame time (with static layers build) and samples of next full frames"""
+    image = QImage(design.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    start = time.perf_counter_ns()
+    design.render(image)
+    first_frame = time.perf_counter_ns()-start
+    samples = []
+    for i in range(iterations):
+        design.set_speed(i % design.speed_range)  # needle moves as it does while driving
+        start = time.perf_counter_ns()
+        design.render(image)
+        samples.append(time.perf_counter_ns()-start)
+    return first_frame, samples
+
+
+def time_painter(design, name: str, iterations: int) -> list:
+    image = QImage(design.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    painter.setRenderHints(design.render_hints, True)
+    painting_function = getattr(design, name)
+    painter.save()
+    painting_function(painter)  # warm up static layers
+    painter.restore()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        painter.save()
+        painting_function(painter)
+        painter.restore()
+        samples.append(time.perf_counter_ns()-start)
+    painter.end()
+    return samples
+
+
+def run(sizes, ranges, hint_names, iterations: int, needle_sprites: bool = False) -> dict:
+    results = []
+    for width, height in sizes:
+        for top_speed in ranges:
+            for hint_name in hint_names:
+                design = build_dashboard(width, height, top_speed, RENDER_HINT_SETS[hint_name], needle_sprites)
+                first_frame, frame_samples = time_frames(design, iterations)
+                result = {"size": [width, height], "speedometer_range": top_speed, "render_hints": hint_name,
+                          "first_frame_ms": first_frame/1e6, "frame": percentiles(frame_samples),
+                          "painters": {name: percentiles(time_painter(design, name, iterations)) for name in PAINTERS}}
+                results.append(result)
+                print(f"{width:>5}x{height:<5} range {top_speed:>3} hints {hint_name:<12} "
+                      f"frame p50 {result['frame']['p50']:7.3f} p95 {result['frame']['p95']:7.3f} "
+                      f"p99 {result['frame']['p99']:7.3f} ms  first {result['first_frame_ms']:7.3f} ms", flush=True)
+                design.deleteLater()
+                QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)  # frees its shared size cache
+    return {"meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                     "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR, "platform": platform.platform(),
+                     "qpa": QGuiApplication.platformName(), "iterations": iterations,
+                     "needle_sprites": needle_sprites},
+            "results": results}
+
+
+def time_import(iterations: int) -> list:
+    """Samples of 'import dashboard' time, each in a new interpreter as at boot"""
+    code = "import time; start = time.perf_counter_ns(); import dashboard; print(time.perf_counter_ns()-start)"
+    directory = os.path.dirname(os.path.abspath(dashboard.__file__))
+    return [int(subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True).stdout)
+            for _ in range(iterations)]
+
+
+def time_startup(width: int, height: int, skip_start_screen: bool, iterations: int) -> list:
+    """Samples of time from creating the dashboard window until its first screen is painted, the \
+    speedometer when start screen is skipped"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        main = dashboard._DashBoardMain(None, (width, height), skip_start_screen=skip_start_screen, skip_loading_screen=True,
+                                        do_not_move=True, skip_start_up_animation=True)
+        first_screen = main.swidget.currentWidget()
+        painted = []
+        first_screen.installEventFilter(_PaintWatcher(first_screen, painted))
+        main.show()
+        while not painted:
+            QApplication.processEvents()
+        samples.append(time.perf_counter_ns()-start)
+        main.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return samples
+
+
+class _PaintWatcher(QObject):
+    # marks a paint event of the watched widget, painting is done when event processing returns
+    def __init__(self, parent, painted: list):
+        super().__init__(parent)
+        self.painted = painted
+
+    def eventFilter(self, source, event):
+        if event.type() == QEvent.Type.Paint:
+            self.painted.append(True)
+        return False
+
+
+def run_startup(width: int, height: int, iterations: int) -> dict:
+    results = {"import": percentiles(time_import(iterations)),
+               "dashboard": percentiles(time_startup(width, height, True, iterations)),
+               "start_screen": percentiles(time_startup(width, height, False, iterations))}
+    for name, result in results.items():
+        print(f"startup {name:<14} p50 {result['p50']:8.3f} p95 {result['p95']:8.3f} p99 {result['p99']:8.3f} ms", flush=True)
+    return {"meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                     "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR, "platform": platform.platform(),
+                     "qpa": QGuiApplication.platformName(), "iterations": iterations, "size": [width, height]},
+            "startup": results, "results": []}
+
+
+def time_fleet_frames(vehicle_count: int, iterations: int) -> list:
+    """Samples of a FleetWall frame at its size hint, state delivery and painting, where the \
+    speed of every vehicle changed since last frame"""
+    import fleet  # needs numpy, only this benchmark does
+    from telemetry import BREAK_FLAG, CHARGING_FLAG, LEFT_INDICATOR_FLAG
+    wall = fleet.FleetWall(vehicle_count)
+    wall.resize(wall.sizeHint())
+    image = QImage(wall.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    states = fleet.fleet_states(vehicle_count)
+    states["battery"] = [index % 101 for index in range(vehicle_count)]
+    states["flags"] = [(BREAK_FLAG, CHARGING_FLAG, LEFT_INDICATOR_FLAG, 0)[index % 4] for index in range(vehicle_count)]
+    samples = []
+    for i in range(iterations + 1):
+        states["speed"] = [(index+i) % wall.top_speed for index in range(vehicle_count)]
+        wall.set_states(states)
+        wall.state_delivery_clock.invalidate()  # a frame interval passed
+        start = time.perf_counter_ns()
+        wall.deliver_pending_states()
+        wall.render(image)
+        samples.append(time.perf_counter_ns()-start)
+    wall.deleteLater()
+    return samples[1:]  # first frame also lays out glyph caches
+
+
+def run_fleet(vehicle_count: int, iterations: int) -> dict:
+    result = percentiles(time_fleet_frames(vehicle_count, iterations))
+    print(f"fleet {vehicle_count} changed tiles frame p50 {result['p50']:7.3f} p95 {result['p95']:7.3f} p99 {result['p99']:7.3f} ms", flush=True)
+    return {"meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                     "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR, "platform": platform.platform(),
+                     "qpa": QGuiApplication.platformName(), "iterations": iterations, "vehicles": vehicle_count},
+            "fleet": result, "results": []}
+
+
+def check_needle_reset(smooth_times=(0, 0.15), timeout: float = 5) -> int:
+    """Set speed 100 from rest with the default speedometer resetter and check that the needle \
+    returns to 0, without and with needle smoothing, returns the number of failures"""
+    failures = 0
+    for smooth_time in smooth_times:
+        design = dashboard._DashBoardContolsDesign(size=QSize(960, 540))
+        design.skip_start_up_animation()
+        design.set_needle_smoothing(smooth_time)
+        design.set_speed(100)
+        start = time.perf_counter()
+        peak = 0
+        while (design.speed or design.needle_motion_timer.isActive() or design.speed_motion_timer.isActive()) \
+                and time.perf_counter()-start < timeout:
+            QApplication.processEvents()
+            peak = max(peak, design.get_speed())
+        if design.speed or not peak:
+            failures += 1
+            print(f"FAILED needle smoothing {smooth_time}: speed {design.get_speed()} km/h after {timeout} s, peak {peak} km/h")
+        else:
+            print(f"needle smoothing {smooth_time}: back at 0 after {time.perf_counter()-start:.2f} s, peak {peak} km/h")
+        design.deleteLater()
+    return failures
+
+
+def print_painters(report: dict):
+    print(f"\n{'painter p50 / p99 ms':<28}" + "".join(f"{r['size'][0]}x{r['size'][1]}/{r['speedometer_range']}/{r['render_hints']}".rjust(26)
+                                                for r in report["results"][:4]))
+    for name in PAINTERS:
+        print(f"{name:<28}" + "".join(f"{r['painters'][name]['p50']:11.3f} / {r['painters'][name]['p99']:<11.3f}".rjust(26)
+                                     for r in report["results"][:4]))
+
+
+def compare(report: dict, baseline_file: str, threshold: float) -> int:
+    """Print configurations whose p50 frame or painter time got slower than threshold times baseline"""
+    with open(baseline_file) as file:
+        baseline_report = json.load(file)
+    baseline = {(tuple(r["size"]), r["speedometer_range"], r["render_hints"]): r for r in baseline_report["results"]}
+    baseline_startup = baseline_report.get("startup", {})
+    regressions = 0
+    for name, result in report.get("startup", {}).items():
+        old = baseline_startup.get(name)
+        if old is not None and old["p50"] > 0 and result["p50"]/old["p50"] > threshold:
+            regressions += 1
+            print(f"REGRESSION startup {name}: p50 {old['p50']:.3f} -> {result['p50']:.3f} ms")
+    old, result = baseline_report.get("fleet"), report.get("fleet")
+    if old is not None and result is not None and old["p50"] > 0 and result["p50"]/old["p50"] > threshold:
+        regressions += 1
+        print(f"REGRESSION fleet frame: p50 {old['p50']:.3f} -> {result['p50']:.3f} ms")
+    for result in report["results"]:
+        old = baseline.get((tuple(result["size"]), result["speedometer_range"], result["render_hints"]))
+        if old is None:
+            continue
+        timings = [("frame", old["frame"], result["frame"])]
+        timings += [(name, old["painters"][name], result["painters"][name]) for name in PAINTERS if name in old["painters"]]
+        for name, old_timing, new_timing in timings:
+            if old_timing["p50"] > 0 and new_timing["p50"]/old_timing["p50"] > threshold:
+                regressions += 1
+                print(f"REGRESSION {result['size'][0]}x{result['size'][1]} range {result['speedometer_range']} "
+                      f"hints {result['render_hints']} {name}: p50 {old_timing['p50']:.3f} -> {new_timing['p50']:.3f} ms")
+    print(f"{regressions} regressions against {baseline_file}")
+    return regressions
+
+
+def parse_size(text: str) -> tuple:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard rendering benchmark")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=SIZES, help="e.g. 1280x720 1920x1080")
+    parser.add_argument("--ranges", nargs="+", type=int, default=RANGES, help="speedometer top speeds from 40 to 400")
+    parser.add_argument("--hints", nargs="+", choices=RENDER_HINT_SETS, default=list(RENDER_HINT_SETS))
+    parser.add_argument("--iterations", type=int, default=50, help="frames timed per configuration")
+    parser.add_argument("--needle-sprites", action="store_true", help="draw hands from pre rendered pixmaps")
+    parser.add_argument("--startup", action="store_true", help="time import and first painted screen (first of --sizes) instead")
+    parser.add_argument("--fleet", action="store_true", help=f"time a FleetWall frame with {FLEET_VEHICLES} changed tiles instead")
+    parser.add_argument("--check-needle-reset", action="store_true", help="check that the speed needle returns to 0 instead")
+    parser.add_argument("--output", help="save results as json")
+    parser.add_argument("--compare", help="json results of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown factor counted as regression")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    if args.check_needle_reset:
+        sys.exit(1 if check_needle_reset() else 0)
+    if args.startup:
+        report = run_startup(*args.sizes[0], args.iterations)
+    elif args.fleet:
+        report = run_fleet(FLEET_VEHICLES, args.iterations)
+    else:
+        report = run(args.sizes, args.ranges, args.hints, args.iterations, args.needle_sprites)
+        print_painters(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    if args.compare:
+        sys.exit(1 if compare(report, args.compare, args.threshold) else 0)
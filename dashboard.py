@@ -24,8 +24,13 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 import random
+from collections import OrderedDict
 from datetime import datetime
+import math
+import threading
+import time
 import sys
+import os
 
 # painter render hints
 _RENDER_HINTS = (
@@ -37,48 +42,130 @@ _RENDER_HINTS = (
     | QPainter.RenderHint.NonCosmeticDefaultPen
     | QPainter.RenderHint.TextAntialiasing
 )
+_FRAME_INTERVAL = 16  # ms, timer interval of time based motion
+_STATIC_LAYER_KEYS = 4  # pixmaps kept per static layer name, for same size dashboards with other ranges or tiers
+_BLINK_INTERVAL = 600  # ms, turn indicators are lit and dark this long each
+
+# render quality tiers, from best to fastest -> (painter render hints, gradient colors, dense pattern brushes)
+_QUALITY_TIERS = {
+    "full": (_RENDER_HINTS, True, True),
+    "balanced": (QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing, True, False),
+    "low": (QPainter.RenderHint.TextAntialiasing, False, False),
+}
+# share of pixels painted by dense pattern brushes, used as alpha of plain brushes replacing them
+_PATTERN_DENSITY = {Qt.BrushStyle.Dense1Pattern: 0.94, Qt.BrushStyle.Dense2Pattern: 0.88, Qt.BrushStyle.Dense3Pattern: 0.63,
+                    Qt.BrushStyle.Dense4Pattern: 0.5, Qt.BrushStyle.Dense5Pattern: 0.37, Qt.BrushStyle.Dense6Pattern: 0.12,
+                    Qt.BrushStyle.Dense7Pattern: 0.06}
+# what a full command queue does with a new command
+_QUEUE_POLICIES = ("drop_oldest", "coalesce", "block")
+# fields whose queued value a newer value replaces, only these are coalesced or dropped by a full queue
+_QUEUE_VALUE_FIELDS = ("speed", "battery")
+# commands setting state fields to bool(value) as well
+_QUEUE_COMMAND_STATES = {"hazard_lights": ("left_indicator_state", "right_indicator_state")}
+# start up animation timeline, track -> keyframes of (ms, value) at speed factor 1
+# motion tracks are interpolated linearly and applied every frame
+_START_UP_MOTION = {
+    "indicator_x": ((0, 1.0), (500, 0.03)),  # parts of width and height, as place_*() functions take them
+    "header_shown": ((0, 0.0), (500, 0.0), (800, 1.0)),
+    "speedometer_top": ((0, 1.01), (800, 1.01), (1300, 0.2)),
+    "speed": ((0, 0), (1300, 0), (2300, 300), (2350, 300), (3350, 0)),
+}
+# step tracks hold each value until next keyframe and have no value before the first one
+_START_UP_STEPS = {
+    "other_visible": ((0, 0), (1300, 1)),
+    "show_time": ((1500, 1),),
+    "left_indicator_lit": ((1700, 1), (1900, 0)),
+    "header_border_color": ((1900, 1), (2100, 0)),
+    "right_indicator_lit": ((2100, 1), (2300, 0)),
+    "horn_state": ((2300, 1), (2500, 0)),
+    "charge_lit": ((2500, 1), (2700, 0)),
+    "break_state": ((2700, 1), (2900, 0)),
+    "accelerator_state": ((2900, 1), (3100, 0)),
+}
+_START_UP_DURATION = max(keyframes[-1][0] for keyframes in (*_START_UP_MOTION.values(), *_START_UP_STEPS.values()))
 _dash_board = None
 
 
+def _keyframe_value(keyframes, time, interpolate=True):
+    """Value of a keyframe track at time, linear between keyframes or held until the next one \
+    when interpolate is False, None before the first keyframe"""
+    if time < keyframes[0][0]:
+        return None
+    for (start_time, start_val), (end_time, end_val) in zip(keyframes, keyframes[1:]):
+        if time < end_time:
+            if not interpolate:
+                return start_val
+            return start_val + (end_val-start_val)*(time-start_time)/(end_time-start_time)
+    return keyframes[-1][1]
+
+
+class _ScreenWidget(QWidget):
+    """WARNING: This is a private class. do not import this."""
+    # page of the stacked widget which lays out its children on its first paint after
+    # a resize, so a window being resized does not restyle them on every resize step
+    def __init__(self, layout_function):
+        super().__init__()
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.layout_function = layout_function
+        self.laid_out_size = None
+
+    def lay_out(self):
+        if self.laid_out_size != self.size():
+            self.laid_out_size = self.size()
+            self.layout_function(self.rect())
+
+    def showEvent(self, event):
+        self.lay_out()
+        super().showEvent(event)
+
+    def paintEvent(self, event):
+        self.lay_out()
+        super().paintEvent(event)
+
+
 class _DashBoardMain(QWidget):
     """WARNING: This is a private class. do not import this."""
     def __init__(self, parent, size: tuple | list = (1280, 720), hide_creator_button: bool = False,
-        skip_start_screen: bool = False, skip_loading_screen: bool = False, do_not_move: bool = False):
+        skip_start_screen: bool = False, skip_loading_screen: bool = False, do_not_move: bool = False,
+        skip_start_up_animation: bool = False):
         super().__init__()
         # Setting window to no icon, frameless and transparent
         self.setWindowFlags(Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.setAutoFillBackground(True)
-        self.setFixedSize(*size)
+        self.setMinimumSize(160, 90)
+        self.resize(*size)
 
         self.oldPos = QCursor().pos()
         self.hide_creator_button = hide_creator_button
         self.skip_start_screen = skip_start_screen
         self.skip_loading_screen = skip_loading_screen
         self.do_not_move = do_not_move
+        self.skip_start_up_animation = skip_start_up_animation
 
         self.initUI()
 
         self.keys_ = {Qt.Key.Key_W: False, Qt.Key.Key_H: False, Qt.Key.Key_Left: False, 
                         Qt.Key.Key_Right: False, Qt.Key.Key_Space: False, Qt.Key.Key_Escape: False}
 
-        self.key_action_timer = QTimer()
+        self.key_action_timer = QTimer(self)
         self.key_action_timer.timeout.connect(self.keyAction)
         self.key_action_timer.start(5)
 
     def initUI(self):
         self.stacked_widget()
-        self.start_screen()
-        self.loding_screen()
+        # start and loading screens are built only when they are shown
+        self.start_screen_widget = None
+        self.loading_screen_widget = None
+        if not self.skip_start_screen:
+            self.start_screen()  # first page is current page
         self.dash_board_design()
 
         if self.skip_start_screen:
-            self.swidget.setCurrentIndex(1)
             if self.skip_loading_screen:
-                self.swidget.setCurrentIndex(2)
-                self.dash_board_design_widget.start_up_animation()
+                self.dash_board_screen()
             else:
-                self.progress_bar_animation.start()
+                self.show_loading_screen()
 
     def stacked_widget(self):
         self.swidget = QStackedWidget(self)
@@ -86,75 +173,90 @@ class _DashBoardMain(QWidget):
         grad = "qlineargradient(spread:pad, x1:0.6, y1:0.4, x2:0.1, y2:0.8, stop:0 {color1}, stop:{value} {color2}, stop:1.0 {color1});".format(
             color1=QColor(0, 0, 0, 100).name(), color2=QColor(13, 13, 13).name(), value=0.5)
         self.setStyleSheet("background-color: %s;"%grad)
-        self.swidget.setFixedSize(self.width(), self.height())
-        self.swidget.setCurrentIndex(0)
+        self.fit_stacked_widget()
+
+    def fit_stacked_widget(self):
+        # largest 16:9 rect in the middle of this widget, screens inside lay out on their next paint
+        size = QSize(16, 9).scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.swidget.setGeometry(QStyle.alignedRect(Qt.LayoutDirection.LeftToRight, Qt.AlignmentFlag.AlignCenter, size, self.rect()))
+
+    def resizeEvent(self, event):
+        self.fit_stacked_widget()
+        super().resizeEvent(event)
 
     def start_screen(self):
-        start_up_widget = QWidget()
-        start_up_widget.setFixedSize(self.width(), self.height())
+        start_up_widget = self.start_screen_widget = _ScreenWidget(self.start_screen_layout)
         self.swidget.addWidget(start_up_widget)
 
-        start_button = QPushButton("Start", start_up_widget)
-        start_button.setFixedSize(self.width()//5, self.width()//5)
-        start_button.move(self.rect().center()-start_button.rect().center())
+        self.start_button = QPushButton("Start", start_up_widget)
+        start_button_shadow = QGraphicsDropShadowEffect()
+        start_button_shadow.setBlurRadius(15)
+        self.start_button.setGraphicsEffect(start_button_shadow)
+        self.start_button.clicked.connect(self.start_button_action)
+        
+        self.creator_info_button = QPushButton("C", start_up_widget)
+        self.creator_info_button.setContentsMargins(0, 0, 80, 0)
+        self.creator_info_button.clicked.connect(self.creator_info_button_action)
+
+        self.creator_info_label = QLabel(start_up_widget)
+        self.creator_info_label.setContentsMargins(0, 0, 0, 0)
+        self.creator_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        grad = "qlineargradient(spread:pad, x1:0.5, y1:0.7, x2:1, y2:0, stop:0 {color1}, stop:{value} {color2}, stop: 1.0 {color2});".format(
+            color1=QColor(255, 153, 51).name(), color2=QColor(77, 77, 0).name(), value=0.5)
+        self.creator_info_label.setStyleSheet("background-color: %s; color: rgb(204, 255, 255)"% grad)
+        self.creator_info_label.setWordWrap(True)
+        self.creator_info_label.setOpenExternalLinks(True)
+        self.creator_info_label.setText('<font color=FloralWhite>Creator info:</font> <br> <font color=Ivory>Name:</font> Prasanna K; <font color=Ivory>GitHub link:</font> <a href="https://github.com/prasanna892"><font color=white>https://github.com/prasanna892.</font></a>')
+
+        self.creator_info_button.setHidden(self.hide_creator_button)
+
+        self.creator_label_ani = QPropertyAnimation(self.creator_info_label, b"pos")
+        self.creator_label_ani.setDuration(600)
+        self.creator_label_ani.setDirection(1)
+
+    def start_screen_layout(self, rect: QRect):
+        width, height = rect.width(), rect.height()
+        start_button = self.start_button
+        start_button.setFixedSize(width//5, width//5)
+        start_button.move(rect.center()-start_button.rect().center())
 
         grad = "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 {color1}, stop:{value} {color2}, stop: 1.0 {color1});".format(
             color1=QColor(240, 0, 0).name(), color2=QColor(255, 80, 0).name(), value=0.5)
         hover_grad = "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 {color1}, stop:{value} {color2}, stop: 1.0 {color1});".format(
             color1=QColor(0, 240, 0).name(), color2=QColor(80, 255, 0).name(), value=0.5)
         start_button_style = """QPushButton {background-color: %s; color: white; border-radius: %spx}
-                                QPushButton::hover {background-color: %s;}"""% (grad, str(self.width()//10), hover_grad)
+                                QPushButton::hover {background-color: %s;}"""% (grad, str(width//10), hover_grad)
         start_button.setStyleSheet(start_button_style)
 
-        start_button_shadow = QGraphicsDropShadowEffect()
-        start_button_shadow.setBlurRadius(15)
-        start_button.setGraphicsEffect(start_button_shadow)
-
         start_button_font = QFont("Consolas", 0, 0, True)
         start_button_font.setBold(True)
-        start_button_font.setPixelSize(round(self.width()*0.05))
+        start_button_font.setPixelSize(round(width*0.05))
         start_button.setFont(start_button_font)
 
-        start_button.clicked.connect(self.start_button_action)
-        
-        creator_info_button = QPushButton("C", start_up_widget)
-        creator_info_button.setContentsMargins(0, 0, 80, 0)
-        creator_info_button.setFixedSize(*map(round, (self.width()*0.05, self.width()*0.05)))
-        creator_info_button.move(self.rect().bottomRight()-creator_info_button.rect().bottomRight()-creator_info_button.rect().center())
+        creator_info_button = self.creator_info_button
+        creator_info_button.setFixedSize(*map(round, (width*0.05, width*0.05)))
+        creator_info_button.move(rect.bottomRight()-creator_info_button.rect().bottomRight()-creator_info_button.rect().center())
         
         creator_info_font = QFont("Arial Black", 0, 0, True)
         creator_info_font.setBold(True)
-        creator_info_font.setPixelSize(round(self.width()*0.03))
+        creator_info_font.setPixelSize(round(width*0.03))
         creator_info_button.setFont(creator_info_font)
 
         creator_info_button_style = """QPushButton {background-color: rgba(0, 0, 0, 0); color: rgb(153, 153, 0); border-radius: %spx;}
                                 QPushButton::hover {color: rgb(255, 255, 0);}"""% str(round(creator_info_button.width()*0.5))
         creator_info_button.setStyleSheet(creator_info_button_style)
-        creator_info_button.clicked.connect(self.creator_info_button_action)
-
-        creator_info_label = QLabel(start_up_widget)
-        creator_info_label.setContentsMargins(0, 0, 0, 0)
-        creator_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        creator_info_label.setFixedSize(*map(round, (self.width()*0.6, self.height()*0.1)))
-        creator_info_label.move(self.rect().center()-creator_info_label.rect().center()-QPoint(-round(self.width()*0.8), round(-self.height()//2+creator_info_label.height()*0.9)))
-        
-        grad = "qlineargradient(spread:pad, x1:0.5, y1:0.7, x2:1, y2:0, stop:0 {color1}, stop:{value} {color2}, stop: 1.0 {color2});".format(
-            color1=QColor(255, 153, 51).name(), color2=QColor(77, 77, 0).name(), value=0.5)
-        creator_info_label.setStyleSheet("background-color: %s; color: rgb(204, 255, 255)"% grad)
 
-        creator_info_font.setPixelSize(round(self.width()*0.015))
+        creator_info_label = self.creator_info_label
+        creator_info_label.setFixedSize(*map(round, (width*0.6, height*0.1)))
+        hidden_pos = rect.center()-creator_info_label.rect().center()-QPoint(-round(width*0.8), round(-height//2+creator_info_label.height()*0.9))
+        creator_info_font.setPixelSize(round(width*0.015))
         creator_info_label.setFont(creator_info_font)
-        creator_info_label.setWordWrap(True)
-        creator_info_label.setOpenExternalLinks(True)
-        creator_info_label.setText('<font color=FloralWhite>Creator info:</font> <br> <font color=Ivory>Name:</font> Prasanna K; <font color=Ivory>GitHub link:</font> <a href="https://github.com/prasanna892"><font color=white>https://github.com/prasanna892.</font></a>')
 
-        creator_info_button.setHidden(self.hide_creator_button)
-
-        self.creator_label_ani = QPropertyAnimation(creator_info_label, b"pos")
-        self.creator_label_ani.setStartValue(creator_info_label.pos())
-        self.creator_label_ani.setEndValue(QPoint(round(self.height()*0.55), creator_info_label.y()))
-        self.creator_label_ani.setDuration(600)
-        self.creator_label_ani.setDirection(1)
+        self.creator_label_ani.setStartValue(hidden_pos)
+        self.creator_label_ani.setEndValue(QPoint(round(height*0.55), hidden_pos.y()))
+        # label stays where its last animation left it
+        shown = self.creator_label_ani.direction() == QAbstractAnimation.Direction.Forward
+        creator_info_label.move(self.creator_label_ani.endValue() if shown else hidden_pos)
 
     def creator_info_button_action(self):
         self.creator_label_ani.setDirection(not self.creator_label_ani.direction())
@@ -162,39 +264,62 @@ class _DashBoardMain(QWidget):
 
     def start_button_action(self):
         if self.skip_loading_screen:
-            self.swidget.setCurrentIndex(2)
-            self.dash_board_design_widget.start_up_animation()
+            self.dash_board_screen()
         else:
-            self.swidget.setCurrentIndex(1)
-            self.progress_bar_animation.start()
+            self.show_loading_screen()
+
+    def show_loading_screen(self):
+        if self.loading_screen_widget is None:
+            self.loding_screen()
+        self.swidget.setCurrentWidget(self.loading_screen_widget)
+        self.progress_bar_animation.start()
 
     def loding_screen(self):
-        loading_screen_widget = QWidget()
+        loading_screen_widget = self.loading_screen_widget = _ScreenWidget(self.loading_screen_layout)
         loading_screen_widget.setContentsMargins(0, 0, 0, 0)
-        loading_screen_widget.setFixedSize(self.width(), self.height())
         self.swidget.addWidget(loading_screen_widget)
 
-        get_ready_label = QLabel(loading_screen_widget)
-        get_ready_label.setFixedSize(*map(round, (self.width()*0.6, self.height()*0.2)))
-        get_ready_label.move(self.rect().center()-get_ready_label.rect().center()-QPoint(0, get_ready_label.height()))
-        get_ready_label.setStyleSheet("background-color: rgba(0, 0, 0, 0); color: rgb(207, 184, 29)")
-        get_ready_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.get_ready_label = QLabel(loading_screen_widget)
+        self.get_ready_label.setStyleSheet("background-color: rgba(0, 0, 0, 0); color: rgb(207, 184, 29)")
+        self.get_ready_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.get_ready_label.setText("Get ready for the ride...")
+
+        self.loding_progress_bar = QProgressBar(loading_screen_widget)
+        self.loding_progress_bar.setContentsMargins(0, 0, 0, 0)
+        self.loding_progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.progress_bar_animation = QPropertyAnimation(self.loding_progress_bar, b"value")
+        self.progress_bar_animation.setStartValue(round(self.swidget.height()*0.1*0.2))
+        self.progress_bar_animation.valueChanged.connect(self.driving_rule_info)
+        self.progress_bar_animation.setEndValue(100)
+        self.progress_bar_animation.setDuration(3000)
+
+        self.saftey_rules = ("Do not drink and drive.", "Always wear a helmet!", "Drive within the speed limits.", 
+                            "Don't use mobile phones while driving.", "Buckle up before you drive.", "Keep a safe distance from vehicles!")
+
+        self.saftey_rule_label = QLabel(loading_screen_widget)
+        self.saftey_rule_label.setStyleSheet("background-color: rgba(0, 0, 0, 0); color: yellow")
+        self.saftey_rule_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.saftey_rule_label.setText(random.sample(self.saftey_rules, 1)[0])
+
+    def loading_screen_layout(self, rect: QRect):
+        width, height = rect.width(), rect.height()
+        get_ready_label = self.get_ready_label
+        get_ready_label.setFixedSize(*map(round, (width*0.6, height*0.2)))
+        get_ready_label.move(rect.center()-get_ready_label.rect().center()-QPoint(0, get_ready_label.height()))
 
         saftey_rule_font = QFont("Consolas", 0, 0, True)
         saftey_rule_font.setBold(True)
-        saftey_rule_font.setPixelSize(round(self.width()*0.035))
+        saftey_rule_font.setPixelSize(round(width*0.035))
         get_ready_label.setFont(saftey_rule_font)
-        get_ready_label.setText("Get ready for the ride...")
 
-        loding_progress_bar = QProgressBar(loading_screen_widget)
-        loding_progress_bar.setContentsMargins(0, 0, 0, 0)
-        loding_progress_bar.setFixedSize(*map(round, (loading_screen_widget.width()*0.7, loading_screen_widget.height()*0.1)))
-        loding_progress_bar.move(self.rect().center()-loding_progress_bar.rect().center())
-        loding_progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        loding_progress_bar = self.loding_progress_bar
+        loding_progress_bar.setFixedSize(*map(round, (width*0.7, height*0.1)))
+        loding_progress_bar.move(rect.center()-loding_progress_bar.rect().center())
 
         loding_progress_bar_font = QFont("Consolas", 0, 0, True)
         loding_progress_bar_font.setBold(True)
-        loding_progress_bar_font.setPixelSize(round(self.width()*0.04))
+        loding_progress_bar_font.setPixelSize(round(width*0.04))
         loding_progress_bar.setFont(loding_progress_bar_font)
 
         grad = "qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 {color1}, stop:{value} {color2}, stop: 1.0 {color3});".format(
@@ -202,32 +327,31 @@ class _DashBoardMain(QWidget):
         loding_progress_bar.setStyleSheet("QProgressBar {background-color: rgba(0, 0, 0, 0); color: white; border-radius: %spx;}"%str(loding_progress_bar.height()//2)
             + "QProgressBar::chunk {background-color: %s; border-radius: %spx;}"%(grad, str(loding_progress_bar.height()//2)))
 
-        self.progress_bar_animation = QPropertyAnimation(loding_progress_bar, b"value")
-        self.progress_bar_animation.setStartValue(loding_progress_bar.height()*0.2)
-        self.progress_bar_animation.valueChanged.connect(self.driving_rule_info)
-        self.progress_bar_animation.setEndValue(100)
-        self.progress_bar_animation.setDuration(3000)
-
-        self.saftey_rules = ("Do not drink and drive.", "Always wear a helmet!", "Drive within the speed limits.", 
-                            "Don't use mobile phones while driving.", "Buckle up before you drive.", "Keep a safe distance from vehicles!")
-
-        self.saftey_rule_label = QLabel(loading_screen_widget)
-        self.saftey_rule_label.setFixedSize(*map(round, (self.width()*0.6, self.height()*0.2)))
-        self.saftey_rule_label.move(self.rect().center()-self.saftey_rule_label.rect().center()+QPoint(0, self.saftey_rule_label.height()))
-        self.saftey_rule_label.setStyleSheet("background-color: rgba(0, 0, 0, 0); color: yellow")
-        self.saftey_rule_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.saftey_rule_label.setFixedSize(*map(round, (width*0.6, height*0.2)))
+        self.saftey_rule_label.move(rect.center()-self.saftey_rule_label.rect().center()+QPoint(0, self.saftey_rule_label.height()))
 
         saftey_rule_font = QFont("Consolas", 0, 0, True)
         saftey_rule_font.setBold(True)
-        saftey_rule_font.setPixelSize(round(self.width()*0.025))
+        saftey_rule_font.setPixelSize(round(width*0.025))
         self.saftey_rule_label.setFont(saftey_rule_font)
-        self.saftey_rule_label.setText(random.sample(self.saftey_rules, 1)[0])
 
     def driving_rule_info(self, val):
         if val%33==0 and val!=99:
             self.saftey_rule_label.setText(random.sample(self.saftey_rules, 1)[0])
         if val==100:
-            self.swidget.setCurrentIndex(2)
+            self.dash_board_screen()
+
+    def dash_board_screen(self):
+        self.swidget.setCurrentWidget(self.dash_board_design_widget)
+        # start and loading screens are never shown again
+        for screen_widget in (self.start_screen_widget, self.loading_screen_widget):
+            if screen_widget is not None:
+                self.swidget.removeWidget(screen_widget)
+                screen_widget.deleteLater()
+        self.start_screen_widget = self.loading_screen_widget = None
+        if self.skip_start_up_animation:
+            self.dash_board_design_widget.skip_start_up_animation()
+        else:
             self.dash_board_design_widget.start_up_animation()
 
     def dash_board_design(self):
@@ -317,14 +441,354 @@ class _DashBoardMain(QWidget):
         return super().eventFilter(source, event)
 
 
+class _SizeCache():
+    """WARNING: This is a private class. do not import this."""
+    # static layers and paint resources shared by all dashboards of the same size,
+    # a cache is dropped when the last dashboard of its size is resized or deleted
+    caches = {}  # (width, height) -> _SizeCache
+
+    def __init__(self, size_key):
+        self.size_key = size_key
+        self.users = 0
+        self.static_layers = {}  # layer name -> OrderedDict of layer key -> pixmap, least recently used first
+        self.paint_resources = {}  # (quality tier, resource key) -> resource
+
+    @classmethod
+    def acquire(cls, size_key):
+        cache = cls.caches.get(size_key)
+        if cache is None:
+            cache = cls.caches[size_key] = cls(size_key)
+        cache.users += 1
+        return cache
+
+    def release(self):
+        self.users -= 1
+        if self.users <= 0 and _SizeCache.caches.get(self.size_key) is self:
+            del _SizeCache.caches[self.size_key]
+
+
+class _BlinkClock(QObject):
+    """WARNING: This is a private class. do not import this."""
+    # one blink phase for every turn indicator of the process, so all of them are lit at the same
+    # time. The timer runs only while some indicator is subscribed
+    phase_sig = pyqtSignal(int)  # 1 lit, 0 dark
+    clock = None
+
+    def __init__(self):
+        super().__init__()
+        self.phase = 0
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+
+    @classmethod
+    def shared(cls):
+        if cls.clock is None:
+            cls.clock = cls()
+        return cls.clock
+
+    def subscribe(self, slot):
+        self.phase_sig.connect(slot)
+        if not self.timer.isActive():
+            self.phase = 0
+            self.timer.start(_BLINK_INTERVAL)
+
+    def unsubscribe(self, slot):
+        self.phase_sig.disconnect(slot)
+        self.stop_unused()
+
+    @pyqtSlot()
+    def stop_unused(self):
+        if not self.receivers(self.phase_sig):  # deleted widgets are disconnected by Qt
+            self.timer.stop()
+
+    def tick(self):
+        self.stop_unused()
+        if not self.timer.isActive():
+            return
+        self.phase = 1-self.phase
+        self.phase_sig.emit(self.phase)
+
+
+class _TripComputer():
+    """WARNING: This is a private class. do not import this."""
+    # trip values updated in O(1) per speed or battery sample from any thread, without history and
+    # without building containers per sample. Recent speed is weighted over time and consumption
+    # over distance, both exponentially
+    def __init__(self, speed_window=60, consumption_window=10):
+        self.lock = threading.Lock()
+        self.speed_window = speed_window  # seconds
+        self.consumption_window = consumption_window  # km
+        self.battery_capacity = 40  # kWh, for consumption in Wh/km
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.start_time = None
+            self.last_time = None
+            self.speed = 0.0  # km/h of last sample
+            self.distance = 0.0  # km
+            self.recent_speed = 0.0
+            self.battery = None  # % of last battery sample
+            self.battery_distance = 0.0  # distance at last battery sample
+            self.consumption = None  # % of battery per km
+
+    def advance(self, now, speed):
+        # distance of the time since last sample, speed changing linearly to the new sample
+        if self.last_time is None:
+            self.start_time = now
+            self.recent_speed = speed
+        else:
+            elapsed = now-self.last_time
+            if elapsed > 0:
+                segment_speed = (self.speed+speed)/2
+                self.distance += segment_speed*elapsed/3600
+                self.recent_speed += (1-math.exp(-elapsed/self.speed_window))*(segment_speed-self.recent_speed)
+        self.last_time = now
+        self.speed = speed
+
+    def add(self, speed, battery, now):
+        """Speed or battery sample, None for a field not in the sample"""
+        with self.lock:
+            self.advance(now, self.speed if speed is None else max(float(speed), 0.0))
+            if battery is None:
+                return
+            if self.battery is None or battery > self.battery:  # first sample or charging
+                self.battery, self.battery_distance = battery, self.distance
+            elif battery < self.battery:
+                used_distance = self.distance-self.battery_distance
+                if used_distance > 0:
+                    consumption = (self.battery-battery)/used_distance
+                    if self.consumption is None:
+                        self.consumption = consumption
+                    else:
+                        self.consumption += (1-math.exp(-used_distance/self.consumption_window))*(consumption-self.consumption)
+                self.battery, self.battery_distance = battery, self.distance
+
+    def values(self, now):
+        """Trip values up to now, speed held since last sample"""
+        with self.lock:
+            if self.last_time is not None:
+                self.advance(now, self.speed)
+            trip_time = 0.0 if self.start_time is None else now-self.start_time
+            consumption = self.consumption
+            return {"distance_km": self.distance, "trip_time_s": trip_time,
+                    "average_speed": self.distance/trip_time*3600 if trip_time > 0 else 0.0,
+                    "recent_speed": self.recent_speed,
+                    "consumption_wh_per_km": None if consumption is None else consumption*self.battery_capacity*10,
+                    "range_km": self.battery/consumption if consumption and self.battery is not None else None}
+
+
+class _CommandQueue():
+    """WARNING: This is a private class. do not import this."""
+    # bounded ring buffer of (field, value) commands, put() from any thread and
+    # take_all() from GUI thread once per frame. The lock is held only for index
+    # updates, producers never touch Qt objects
+    def __init__(self, capacity=256, policy="coalesce"):
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        self.in_flight = {}  # field -> value taken by GUI thread and not yet applied
+        self.configure(capacity, policy)
+        self.reset_counters()
+
+    def configure(self, capacity, policy):
+        with self.lock:
+            commands = self.commands() if hasattr(self, "slots") else []
+            self.capacity = capacity
+            self.policy = policy
+            self.reset_slots(max(capacity, len(commands)))  # no queued command is lost
+            for field, val, enqueue_time in commands:
+                self.insert(field, val, enqueue_time)
+            self.not_full.notify_all()
+
+    def reset_slots(self, size):
+        self.slots = [None]*size  # [field, value, enqueue time]
+        self.head = self.tail = 0  # oldest and next command numbers, slot is number % len(slots)
+        self.field_positions = {}  # field -> number of its newest queued command
+
+    def reset_counters(self):
+        self.enqueued = 0
+        self.dropped = 0  # value commands dropped for newer ones
+        self.dropped_fields = {}  # field -> dropped count
+        self.coalesced = 0  # new values merged into a queued command of same field
+        self.unchanged = 0  # state values equal to the newest queued or shown value, not queued
+        self.overflowed = 0  # commands queued over capacity as no value command could be dropped
+        self.blocked = 0  # put() calls which waited for room
+        self.drained = 0
+        self.max_length = 0
+        self.enqueue_time_total = 0
+        self.enqueue_time_worst = 0
+        self.queue_delay_total = 0
+        self.queue_delay_worst = 0
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def commands(self):
+        return [self.slots[number % len(self.slots)] for number in range(self.head, self.tail)]
+
+    def insert(self, field, val, enqueue_time):
+        if len(self) >= len(self.slots):
+            commands = self.commands()
+            self.reset_slots(len(self.slots)*2)
+            for command in commands:
+                self.insert(*command)
+        self.slots[self.tail % len(self.slots)] = [field, val, enqueue_time]
+        self.field_positions[field] = self.tail
+        self.tail += 1
+
+    def drop_value(self, new_field):
+        # dropping the oldest value command which a newer command of its field replaces anyway,
+        # the newest value of a field and all other commands are never dropped
+        size = len(self.slots)
+        for number in range(self.head, self.tail):
+            field = self.slots[number % size][0]
+            if field in _QUEUE_VALUE_FIELDS and (field == new_field or self.field_positions[field] != number):
+                break
+        else:
+            return False
+        if self.field_positions[field] == number:
+            del self.field_positions[field]
+        # older commands move one slot up, keeping their order
+        for older in range(number, self.head, -1):
+            moved = self.slots[older % size] = self.slots[(older-1) % size]
+            if self.field_positions[moved[0]] == older-1:
+                self.field_positions[moved[0]] = older
+        self.slots[self.head % size] = None
+        self.head += 1
+        self.dropped += 1
+        self.dropped_fields[field] = self.dropped_fields.get(field, 0) + 1
+        return True
+
+    def put(self, field, val):
+        """Returns True when queue was empty, so consumer should be woken up"""
+        with self.lock:
+            return self.put_locked(field, val)
+
+    def newest_value(self, field, shown):
+        # newest queued, taken or shown value of field, shown is [shown_state function or its result]
+        setters = [command for command, fields in _QUEUE_COMMAND_STATES.items() if field in fields]
+        numbers = [self.field_positions[name] for name in [field]+setters if name in self.field_positions]
+        if numbers:
+            name, val, _ = self.slots[max(numbers) % len(self.slots)]
+            return val if name == field else bool(val)
+        if field in self.in_flight:
+            return self.in_flight[field]
+        if callable(shown[0]):
+            # read under the lock, a value taken before it is already applied
+            shown[0] = shown[0]()
+        return shown[0].get(field)  # None is never given as value
+
+    def put_state(self, state, shown_state):
+        """Queue state fields whose value differs from the newest queued, taken or shown value \
+        of the field, shown_state() gives the shown values and is called at most once. Returns \
+        queued fields and True when queue was empty"""
+        queued = []
+        was_empty = False
+        shown = [shown_state]
+        with self.lock:
+            for field, val in state.items():
+                if self.newest_value(field, shown) == val:
+                    self.unchanged += 1
+                    continue
+                was_empty = self.put_locked(field, val) or was_empty
+                queued.append(field)
+        return queued, was_empty
+
+    def put_toggle(self, field, shown_state):
+        """Queue the opposite of the newest queued, taken or shown value of a state field, so \
+        toggles are kept as absolute states. Returns the queued value and True when queue was empty"""
+        with self.lock:
+            self.wait_for_room()  # a toggle taken while waiting would be lost otherwise
+            val = not self.newest_value(field, [shown_state])
+            return val, self.put_locked(field, val)
+
+    def wait_for_room(self):
+        # "block" policy, waiting on GUI (main) thread would never end, it drops or overflows instead
+        if len(self) >= self.capacity and self.policy == "block" and threading.current_thread() is not threading.main_thread():
+            self.blocked += 1
+            while len(self) >= self.capacity:
+                self.not_full.wait()
+
+    def put_locked(self, field, val):
+        # put() with lock already held
+        enqueue_time = time.perf_counter()
+        was_empty = False
+        position = self.field_positions.get(field) if field in _QUEUE_VALUE_FIELDS else None
+        if len(self) >= self.capacity and self.policy == "coalesce" and position is not None:
+            self.slots[position % len(self.slots)][1] = val  # keeps enqueue time of first value
+            self.coalesced += 1
+        else:
+            self.wait_for_room()
+            was_empty = not len(self)
+            if len(self) >= self.capacity and not self.drop_value(field):
+                self.overflowed += 1
+            self.insert(field, val, enqueue_time)
+            self.enqueued += 1
+            self.max_length = max(self.max_length, len(self))
+        enqueue_time = time.perf_counter()-enqueue_time
+        self.enqueue_time_total += enqueue_time
+        self.enqueue_time_worst = max(self.enqueue_time_worst, enqueue_time)
+        return was_empty
+
+    def take_all(self):
+        """Returns queued commands as (field, value, enqueue time) from oldest to newest"""
+        with self.lock:
+            commands = self.commands()
+            self.reset_slots(self.capacity)  # also gives back room grown by overflow
+            self.in_flight = {}
+            for field, val, _ in commands:
+                self.in_flight.update(dict.fromkeys(_QUEUE_COMMAND_STATES.get(field, ()), bool(val)))
+                self.in_flight[field] = val
+            self.drained += len(commands)
+            now = time.perf_counter()
+            for _, _, enqueue_time in commands:
+                self.queue_delay_total += now-enqueue_time
+                self.queue_delay_worst = max(self.queue_delay_worst, now-enqueue_time)
+            self.not_full.notify_all()
+        return commands
+
+    def applied(self):
+        # taken commands are shown now, later values are compared with the dashboard again
+        with self.lock:
+            self.in_flight = {}
+
+    def counters(self):
+        with self.lock:
+            puts = self.enqueued + self.coalesced
+            return {"capacity": self.capacity, "policy": self.policy, "queued": len(self), "max_queued": self.max_length,
+                    "enqueued": self.enqueued, "coalesced": self.coalesced, "unchanged": self.unchanged, "dropped": self.dropped,
+                    "dropped_fields": dict(self.dropped_fields), "overflowed": self.overflowed,
+                    "blocked": self.blocked, "drained": self.drained,
+                    "enqueue_avg_us": self.enqueue_time_total/puts*1e6 if puts else 0,
+                    "enqueue_worst_us": self.enqueue_time_worst*1e6,
+                    "queue_delay_avg_ms": self.queue_delay_total/self.drained*1e3 if self.drained else 0,
+                    "queue_delay_worst_ms": self.queue_delay_worst*1e3}
+
+
 class _DashBoardContolsDesign(QWidget):
     """WARNING: This is a private class. do not import this."""
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, size: QSize = None):
         super(_DashBoardContolsDesign, self).__init__(parent)
         self.parent_ = parent
-        self.resize(self.parent_.size())
+        self.resize(self.parent_.size() if size is None else size)
         self.setContentsMargins(0, 0, 0, 0)
 
+        # size cache in a list, so it can be released on delete without this object
+        held_size_cache = self.held_size_cache = [None]
+        self.destroyed.connect(lambda: held_size_cache[0] is not None and held_size_cache[0].release())
+        self.other_visible = False
+        self.history = None  # object with append(speed, battery, break_state) method, see history.py
+        self.trip_computer = None  # _TripComputer shown by trip readout
+        self.trip_text = ()
+        self.quality_properties()
+        self.needle_sprite_properties()
+        self.needle_motion_properties()
+
+        # positions of animated parts relative to size, kept when geometry is recomputed
+        self.header_shown = 1
+        self.indicator_x = 0.03
+        self.speedometer_top = 1.01  # below bottom edge until start up animation
         self.header_properties()
         self.indicators_properties()
         self.horn_properties()
@@ -332,17 +796,150 @@ class _DashBoardContolsDesign(QWidget):
         self.break_properties()
         self.accelerator_properties()
         self.speedometer_properties()
+        self.update_geometry()
         self.battery_properties()
+        self.performance_properties()
+        self.start_up_properties()
+
+    def quality_properties(self):
+        self.auto_quality = False
+        self.frame_budget = 1/60  # seconds of paint time allowed in auto quality
+        self.quality_paint_times = []
+        self.set_quality_tier("full")
+
+    def set_quality_tier(self, tier):
+        self.quality_tier = tier
+        self.render_hints, self.gradients_enabled, self.patterns_enabled = _QUALITY_TIERS[tier]
+        self.clear_needle_sprites()
+        self.quality_paint_times = []
+        self.update()
+
+    def set_render_quality(self, quality, frame_budget_ms):
+        self.frame_budget = frame_budget_ms/1000
+        self.auto_quality = quality == "auto"
+        if not self.auto_quality and quality != self.quality_tier:
+            self.set_quality_tier(quality)
+
+    def adapt_quality(self, paint_time):
+        # judging every 30 paints, stepping down when over budget and back up with half the budget free
+        self.quality_paint_times.append(paint_time)
+        if len(self.quality_paint_times) < 30:
+            return
+        paint_time_avg = sum(self.quality_paint_times)/len(self.quality_paint_times)
+        self.quality_paint_times = []
+        tiers = tuple(_QUALITY_TIERS)
+        tier_idx = tiers.index(self.quality_tier)
+        if paint_time_avg > self.frame_budget and tier_idx < len(tiers)-1:
+            self.set_quality_tier(tiers[tier_idx+1])
+        elif paint_time_avg < self.frame_budget*0.5 and tier_idx > 0:
+            self.set_quality_tier(tiers[tier_idx-1])
+
+    def tier_brush(self, brush):
+        """Gradient as it is, or its middle color when quality tier has no gradients"""
+        if self.gradients_enabled or not isinstance(brush, QGradient):
+            return brush
+        stops = brush.stops()
+        return QColor(stops[len(stops)//2][1])
+
+    def tier_pattern_brush(self, color, style):
+        """Dense pattern brush, or plain brush of same coverage when quality tier has no patterns"""
+        if self.patterns_enabled:
+            return QBrush(color, style)
+        color = QColor(color)
+        color.setAlphaF(color.alphaF()*_PATTERN_DENSITY[style])
+        return QBrush(color)
+
+    def needle_sprite_properties(self):
+        self.needle_sprites_enabled = False
+        self.needle_sprite_limit = 16*1024*1024  # bytes of cached needle pixmaps
+        self.needle_sprites = OrderedDict()  # (needle name, angle) -> (position from center, pixmap), least recently used first
+        self.needle_sprite_bytes = 0
+
+    def needle_motion_properties(self):
+        self.needle_smoothing = 0  # seconds a needle takes to reach a new value, 0 jumps at once
+        self.needle_targets = {}  # needle attribute ("speed" or "battery") -> value it converges to
+        self.needle_velocities = {}  # needle attribute -> units per second
+        self.needle_inputs = {}  # needle attribute -> (last input value, (needle target, speed angle factor) it gave)
+
+        # runs only while a needle is converging
+        self.needle_motion_clock = QElapsedTimer()
+        self.needle_motion_timer = QTimer(self)
+        self.needle_motion_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.needle_motion_timer.timeout.connect(self.needle_motion)
+
+    def set_needle_smoothing(self, smooth_time):
+        self.needle_smoothing = smooth_time
+        if not smooth_time:  # converging needles jump to their targets
+            for name, target in self.needle_targets.items():
+                setattr(self, name, target)
+            self.needle_targets.clear()
+            self.needle_velocities.clear()
+            self.needle_motion_timer.stop()
+            self.update(self.speedometer_rect().united(self.battery_indicator_rect()))
+
+    def move_needle(self, name, target):
+        """Set a needle attribute, directly or as target of critically damped motion when smoothing is on"""
+        if not self.needle_smoothing or target == getattr(self, name):
+            setattr(self, name, target)
+            self.needle_targets.pop(name, None)
+            self.needle_velocities.pop(name, None)
+            return
+        self.needle_targets[name] = target
+        self.needle_velocities.setdefault(name, 0.0)
+        if not self.needle_motion_timer.isActive():
+            self.needle_motion_clock.start()
+            self.needle_motion_timer.start(_FRAME_INTERVAL)
+
+    def needle_target(self, name):
+        return self.needle_targets.get(name, getattr(self, name))
+
+    def needle_motion(self):
+        # critically damped spring (no overshoot) integrated over real elapsed time, once per frame
+        elapsed = self.needle_motion_clock.restart()/1000
+        omega = 2/self.needle_smoothing
+        x = omega*elapsed
+        decay = 1/(1 + x + 0.48*x*x + 0.235*x*x*x)
+        for name, target in tuple(self.needle_targets.items()):
+            offset = getattr(self, name)-target
+            change = (self.needle_velocities[name] + omega*offset)*elapsed
+            velocity = self.needle_velocities[name] = (self.needle_velocities[name] - omega*change)*decay
+            value = target + (offset+change)*decay
+            if abs(value-target) < 0.05 and abs(velocity) < 0.5:  # settled, in speedometer angle and battery units
+                value = target
+                del self.needle_targets[name]
+                del self.needle_velocities[name]
+            setattr(self, name, value)
+            self.update(self.speedometer_rect() if name == "speed" else self.battery_indicator_rect())
+        if not self.needle_targets:
+            self.needle_motion_timer.stop()
+
+    def set_needle_sprites(self, enable, memory_limit_mb):
+        if (self.needle_sprites_enabled, self.needle_sprite_limit) == (bool(enable), round(memory_limit_mb*1024*1024)):
+            return
+        self.needle_sprites_enabled = bool(enable)
+        self.needle_sprite_limit = round(memory_limit_mb*1024*1024)
+        self.clear_needle_sprites()
+        self.update(self.speedometer_rect())
+        self.update(self.battery_indicator_rect())
+
+    def clear_needle_sprites(self):
+        if hasattr(self, "needle_sprites"):  # called on resize before needle_sprite_properties()
+            self.needle_sprites.clear()
+            self.needle_sprite_bytes = 0
 
     def header_properties(self):
         self.header_border_color_lst = (QColorConstants.Svg.orchid, QColorConstants.Svg.red)
         self.header_border_color = 0
 
         self.show_time = 0
-        self.time_update_timer = QTimer()
-        self.time_update_timer.timeout.connect(lambda: self.repaint())
-        self.time_update_timer.start(1000)
-
+        self.time_text = ""
+        # fires at each wall clock second, runs only while dashboard is shown
+        self.time_update_timer = QTimer(self)
+        self.time_update_timer.setSingleShot(True)
+        self.time_update_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.time_update_timer.timeout.connect(self.time_update)
+
+    def header_geometry(self):
         # drawing boarder
         header_trans = QTransform()
         header_trans.scale(self.width()*0.012, self.height()*0.008)
@@ -361,11 +958,44 @@ class _DashBoardContolsDesign(QWidget):
         scaled_header_inner_bounding_rect = QRect(self.scaled_header_inner.boundingRect().toRect())
         self.scaled_header_inner.translate(self.rect().center()-scaled_header_inner_bounding_rect.center())
         self.scaled_header_inner.translate(0, -self.rect().height()*0.5+scaled_header_inner_bounding_rect.height()*0.5)
+        self.place_header(self.header_shown)
+
+    def place_header(self, shown):
+        # shown part of header height from 0 (above the top edge) to 1
+        self.header_shown = shown
+        header_height = self.scaled_header_border.boundingRect().height()
+        self.scaled_header_border.translate(0, -self.scaled_header_border.boundingRect().y()-header_height)
+        self.scaled_header_inner.translate(0, -self.scaled_header_inner.boundingRect().y()-header_height)
+        self.scaled_header_border.translate(0, round(header_height*shown))
+        self.scaled_header_inner.translate(0, round(header_height*shown))
+
+    def header_rect(self):
+        return self.dirty_rect(self.scaled_header_border.boundingRect())
+
+    def format_time(self):
+        now = datetime.now()
+        self.time_text = now.strftime("%I:%M:%S%p %a %d")
+        return now
+
+    def time_update(self):
+        # text is formatted once a second here, only its own rect is painted again
+        time_text, time_rect = self.time_text, self.time_rect()
+        now = self.format_time()
+        if self.show_time and self.time_text != time_text:
+            self.update(time_rect.united(self.time_rect()))
+        self.trip_update()
+        if self.isVisible() and not self.window().isMinimized():
+            self.time_update_timer.start(1000 - now.microsecond//1000)
+
+    def time_rect(self):
+        time_rect = self.font_metrics(round(self.width()*0.04)).boundingRect(self.time_text)
+        time_rect.moveCenter(self.scaled_header_inner.boundingRect().toRect().center())
+        return self.dirty_rect(QRectF(time_rect))
 
     def header_painting(self, painter: QPainter):
         # drawing boarder
-        painter.setPen(QPen(QGradient(QGradient.Preset.Blessing), round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
-        painter.setBrush(QBrush(self.header_border_color_lst[self.header_border_color], Qt.BrushStyle.Dense4Pattern))
+        painter.setPen(self.preset_pen(QGradient.Preset.Blessing, round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
+        painter.setBrush(self.tier_pattern_brush(self.header_border_color_lst[self.header_border_color], Qt.BrushStyle.Dense4Pattern))
         painter.drawPolygon(self.scaled_header_border)
 
         # drawing inner
@@ -373,103 +1003,136 @@ class _DashBoardContolsDesign(QWidget):
         painter.setBrush(QBrush(QColor(76, 97, 78, 100)))
         painter.drawPolygon(self.scaled_header_inner)
 
-        painter.setPen(QPen(QGradient(QGradient.Preset.Blessing), round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
+        painter.setPen(self.preset_pen(QGradient.Preset.Blessing, round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
         painter.drawPolygon(self.scaled_header_border)
 
         # drawing time
-        now = datetime.now()
+        if not self.time_update_timer.isActive():  # clock stopped while hidden, or rendered without showing
+            self.format_time()
 
-        time_font = QFont("Consolas", 0, 0, True)
-        time_font.setPixelSize(round(self.width()*0.04))
-        time_fm = QFontMetrics(time_font)
-        time_rect = time_fm.boundingRect(now.strftime("%I:%M:%S%p %d %a"))
-        painter.setFont(time_font)
+        time_font_size = round(self.width()*0.04)
+        time_rect = self.font_metrics(time_font_size).boundingRect(self.time_text)
+        painter.setFont(self.consolas_font(time_font_size))
 
         scaled_header_inner_bounding_rect = self.scaled_header_inner.boundingRect().toRect()
         time_rect.moveCenter(scaled_header_inner_bounding_rect.center())
 
-        painter.setPen(QPen(QGradient(QGradient.Preset.FreshOasis), round(self.width()*0.0012)))
-        if self.show_time: painter.drawText(time_rect, Qt.AlignmentFlag.AlignCenter, now.strftime("%I:%M:%S%p %a %d"))
+        painter.setPen(self.preset_pen(QGradient.Preset.FreshOasis, round(self.width()*0.0012)))
+        if self.show_time: painter.drawText(time_rect, Qt.AlignmentFlag.AlignCenter, self.time_text)
 
     def indicators_properties(self):
-        self.indicator_timer = QTimer()
-        self.indicator_timer.timeout.connect(self.indicator_blink_animation)
-
         self.indicator_color_list = (QColorConstants.DarkGreen, QColorConstants.Green)
 
-        self.right_indicator_color = self.indicator_color_list[0]
-        self.left_indicator_color = self.indicator_color_list[0]
-
         self.right_indicator_state = 0
         self.left_indicator_state = 0
 
-        self.right_indicator_blink = 0
-        self.left_indicator_blink = 0
+        # shown blink phase of each side, 1 lit
+        self.right_indicator_lit = 0
+        self.left_indicator_lit = 0
+        self.blink_subscribed = False  # to the shared blink clock, while an indicator is on
 
+    def indicators_geometry(self):
         # left indicator
         indicator_trans = QTransform()
         indicator_trans.scale(self.width()*0.001, self.height()*0.0015)
         left_idicator = QPolygonF((QPointF(40, 80), QPointF(90, 120), QPointF(90, 100), QPointF(150, 100),
                                     QPointF(150, 60), QPointF(90, 60), QPointF(90, 40)))
         self.scaled_left_idicator = indicator_trans.map(left_idicator)
-        self.scaled_left_idicator.translate(-self.scaled_left_idicator.boundingRect().x(), -self.scaled_left_idicator.boundingRect().y())
-        self.scaled_left_idicator.translate(self.width()*0.03, self.height()*0.06)
 
         # right indicator
         rotate_t = QTransform()
         rotate_t.rotate(180, Qt.Axis.YAxis)
-        self.scaled_right_idicator = self.scaled_left_idicator
-        self.scaled_right_idicator = rotate_t.map(self.scaled_right_idicator)
+        self.scaled_right_idicator = rotate_t.map(self.scaled_left_idicator)
+        self.place_indicators(self.indicator_x)
+
+    def place_indicators(self, x):
+        # x of left indicator as part of width, right indicator is placed as its mirror
+        self.indicator_x = x
+        self.scaled_left_idicator.translate(-self.scaled_left_idicator.boundingRect().x(), -self.scaled_left_idicator.boundingRect().y())
+        self.scaled_left_idicator.translate(round(self.width()*x), self.height()*0.06)
         self.scaled_right_idicator.translate(-self.scaled_right_idicator.boundingRect().x(), -self.scaled_right_idicator.boundingRect().y())
         self.scaled_right_idicator.translate(self.width()-self.scaled_right_idicator.boundingRect().width()-self.scaled_left_idicator.boundingRect().x(), self.height()*0.06)
 
+    def indicators_rect(self):
+        return self.left_indicator_rect().united(self.right_indicator_rect())
+
+    def left_indicator_rect(self):
+        return self.dirty_rect(self.scaled_left_idicator.boundingRect())
+
+    def right_indicator_rect(self):
+        return self.dirty_rect(self.scaled_right_idicator.boundingRect())
+
+    def indicator_pen_brush(self, lit):
+        color = self.indicator_color_list[lit]
+        return self.paint_resource(("indicator", lit), lambda: (QPen(color, round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin),
+                                                                self.tier_pattern_brush(color, Qt.BrushStyle.Dense3Pattern)))
+
     def indicators_painting(self, painter: QPainter):
         # drawing left indicator
-        painter.setPen(QPen(self.left_indicator_color, round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
-        painter.setBrush(QBrush(self.left_indicator_color, Qt.BrushStyle.Dense3Pattern))
+        pen, brush = self.indicator_pen_brush(self.left_indicator_lit)
+        painter.setPen(pen)
+        painter.setBrush(brush)
         painter.drawPolygon(self.scaled_left_idicator)
         
         # drawing right indicator
-        painter.setPen(QPen(self.right_indicator_color, round(self.width()*0.0012), join=Qt.PenJoinStyle.MiterJoin))
-        painter.setBrush(QBrush(self.right_indicator_color, Qt.BrushStyle.Dense3Pattern))
+        pen, brush = self.indicator_pen_brush(self.right_indicator_lit)
+        painter.setPen(pen)
+        painter.setBrush(brush)
         painter.drawPolygon(self.scaled_right_idicator)
 
+    def set_indicator_state(self, indecator, val):
+        if (self.left_indicator_state, self.right_indicator_state)[indecator] != bool(val):
+            self.indicator_triger(indecator)
+
     def indicator_triger(self, indecator):
         if indecator==0: # left indicator
             self.left_indicator_state = not self.left_indicator_state
         if indecator==1: # right indicator
             self.right_indicator_state = not self.right_indicator_state
 
-        if self.right_indicator_state or self.left_indicator_state:
-            self.indicator_timer.start(600) # blink indicator interval of 600ms
-        else:
-            self.indicator_blink_animation()
-            self.indicator_timer.stop()
-            
-    def indicator_blink_animation(self):
-        if self.right_indicator_state:
-            self.right_indicator_color = self.indicator_color_list[self.right_indicator_blink]
-            self.right_indicator_blink = not self.right_indicator_blink
-        else:
-            self.right_indicator_color = self.indicator_color_list[0]
-
-        if self.left_indicator_state:
-            self.left_indicator_color = self.indicator_color_list[self.left_indicator_blink]
-            self.left_indicator_blink = not self.left_indicator_blink
-        else:
-            self.left_indicator_color = self.indicator_color_list[0]
-
-        self.repaint()
+        self.update_indicator_blink()
+
+    def set_hazard_lights(self, val):
+        # both sides switched in one step, blinking in the same clock phase they never drift apart
+        self.left_indicator_state = self.right_indicator_state = bool(val)
+        self.update_indicator_blink()
+
+    def update_indicator_blink(self):
+        blink_clock = _BlinkClock.shared()
+        blinking = bool(self.left_indicator_state or self.right_indicator_state)
+        if blinking and not self.blink_subscribed:
+            blink_clock.subscribe(self.indicator_blink_animation)
+        elif not blinking and self.blink_subscribed:
+            blink_clock.unsubscribe(self.indicator_blink_animation)
+        self.blink_subscribed = blinking
+        self.indicator_blink_animation(blink_clock.phase)  # joining the running phase
+
+    def stop_indicator_blink(self):
+        # indicators which are on stay lit, for still images
+        if self.blink_subscribed:
+            _BlinkClock.shared().unsubscribe(self.indicator_blink_animation)
+            self.blink_subscribed = False
+        self.left_indicator_lit = int(bool(self.left_indicator_state))
+        self.right_indicator_lit = int(bool(self.right_indicator_state))
+
+    @pyqtSlot(int)  # a Qt slot is disconnected by Qt when the widget is deleted
+    def indicator_blink_animation(self, phase):
+        # only the side whose shown phase changes is painted again
+        left_lit = phase if self.left_indicator_state else 0
+        if left_lit != self.left_indicator_lit:
+            self.left_indicator_lit = left_lit
+            self.update(self.left_indicator_rect())
+        right_lit = phase if self.right_indicator_state else 0
+        if right_lit != self.right_indicator_lit:
+            self.right_indicator_lit = right_lit
+            self.update(self.right_indicator_rect())
 
     def horn_properties(self):
         self.horn_sound_color_lst = (QColor(67, 13, 13, 200), QGradient(QGradient.Preset.BlackSea))
         self.horn_sound_color_idx = 0
         self.horn_state = 0 # 0 -> off 1 -> on
 
-    def horn_painting(self, painter: QPainter):
-        painter.setPen(QPen(QColorConstants.Black, round(self.width()*0.0012)))
-        painter.setBrush(QBrush(QGradient(QGradient.Preset.RichMetal)))
-
+    def scaled_horn(self):
         horn_trans = QTransform()
         horn_trans.scale(self.width()*0.0012, self.height()*0.002)
 
@@ -479,6 +1142,21 @@ class _DashBoardContolsDesign(QWidget):
         scaled_horn = horn_trans.map(horn)
         scaled_horn.translate(-scaled_horn.boundingRect().x(), -scaled_horn.boundingRect().y())
         scaled_horn.translate(self.width()*0.03, self.height()*0.7)
+        return scaled_horn
+
+    def horn_rect(self):
+        # horn with the widest sound arc
+        horn_rect = self.scaled_horn().boundingRect().toRect()
+        sound_rect = QRect(0, 0, round(horn_rect.width()*1.5), round(horn_rect.height()*1.5))
+        sound_rect.moveCenter(horn_rect.center())
+        sound_rect.moveRight(round(horn_rect.width()*1.7))
+        return self.dirty_rect(QRectF(horn_rect.united(sound_rect)))
+
+    def horn_painting(self, painter: QPainter):
+        painter.setPen(QPen(QColorConstants.Black, round(self.width()*0.0012)))
+        painter.setBrush(self.preset_brush(QGradient.Preset.RichMetal))
+
+        scaled_horn = self.scaled_horn()
         painter.drawPolygon(scaled_horn)
 
         horn_rect = scaled_horn.boundingRect().toRect()
@@ -486,7 +1164,7 @@ class _DashBoardContolsDesign(QWidget):
         painter.setPen(QPen(QColorConstants.Gray, round(self.width()*0.0012)))
         painter.drawLine(horn_rect.topRight(), horn_rect.bottomRight())
 
-        painter.setPen(QPen(self.horn_sound_color_lst[self.horn_sound_color_idx], round(self.width()*0.0025), cap=Qt.PenCapStyle.RoundCap))
+        painter.setPen(self.state_pen("horn", self.horn_sound_color_lst, self.horn_sound_color_idx, round(self.width()*0.0025), cap=Qt.PenCapStyle.RoundCap))
 
         sound_rect1 = QRect(0, 0, round(horn_rect.width()*1.5), round(horn_rect.height()*1.5))
         sound_rect1.moveCenter(horn_rect.center())
@@ -506,7 +1184,7 @@ class _DashBoardContolsDesign(QWidget):
     def set_horn_state(self, val):
         self.horn_sound_color_idx = val
         if self.horn_sound_color_idx != self.horn_state:
-            self.repaint()
+            self.update(self.horn_rect())
         self.horn_state = val
 
     def charge_properties(self):
@@ -517,42 +1195,51 @@ class _DashBoardContolsDesign(QWidget):
     def set_charge_state(self, val):
         self.charge_default_state = val
         self.charge_state = val
-        self.repaint()
+        self.update(self.charge_rect())
+
+    def charge_rect(self):
+        charge_rect = self.text_rect("CHARGING", round(self.width()*0.031))
+        charge_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.328, -self.rect().height()*0.07).toPoint())
+        return self.dirty_rect(QRectF(charge_rect))
 
     def charge_painting(self, painter: QPainter):
-        # setting charge font
-        charge_font = QFont("Consolas", 0, 0, True)
-        charge_font.setPixelSize(round(self.width()*0.031))
-        charge_fm = QFontMetrics(charge_font)
-        charge_rect = charge_fm.boundingRect("CHARGING")
-        painter.setFont(charge_font)
+        # setting charge text
+        charge_font_size = round(self.width()*0.031)
+        charge_rect = self.text_rect("CHARGING", charge_font_size)
 
         charge_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.328, -self.rect().height()*0.07).toPoint())
 
-        painter.setPen(QPen(self.charge_color_lst[self.charge_state], round(self.width()*0.0025)))
-        painter.drawText(charge_rect, Qt.AlignmentFlag.AlignCenter, "CHARGING")
+        charge_pen = self.state_pen("charge", self.charge_color_lst, self.charge_state, round(self.width()*0.0025))
+        self.static_text_painting(painter, ("charge", self.charge_state), charge_rect, "CHARGING", charge_font_size, charge_pen)
 
     def break_properties(self):
         self.break_state = 0
         self.break_color_lst = (QColor(67, 13, 13, 200), QGradient(QGradient.Preset.ColorfulPeach))
 
     def set_break_state(self, val):
+        if self.break_state == val and self.header_border_color == val:  # key held down sets it on every key action tick
+            return
         self.break_state = val
         self.header_border_color = val
-        self.repaint()
+        self.update(self.header_rect())
+        self.update(self.break_rect())
+        self.start_speed_motion()
+        self.record_history()
+
+    def break_rect(self):
+        break_rect = self.text_rect("BREAK", round(self.width()*0.045))
+        break_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.345, self.rect().height()*0.1).toPoint())
+        return self.dirty_rect(QRectF(break_rect))
 
     def break_painting(self, painter: QPainter):
-        # setting break font
-        break_font = QFont("Consolas", 0, 0, True)
-        break_font.setPixelSize(round(self.width()*0.045))
-        break_fm = QFontMetrics(break_font)
-        break_rect = break_fm.boundingRect("BREAK")
-        painter.setFont(break_font)
+        # setting break text
+        break_font_size = round(self.width()*0.045)
+        break_rect = self.text_rect("BREAK", break_font_size)
 
         break_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.345, self.rect().height()*0.1).toPoint())
 
-        painter.setPen(QPen(self.break_color_lst[self.break_state], round(self.width()*0.0025)))
-        painter.drawText(break_rect, Qt.AlignmentFlag.AlignCenter, "BREAK")
+        break_pen = self.state_pen("break", self.break_color_lst, self.break_state, round(self.width()*0.0025))
+        self.static_text_painting(painter, ("break", self.break_state), break_rect, "BREAK", break_font_size, break_pen)
 
     def accelerator_properties(self):
         self.speed_angle_factor = 200/300  # 200 default top speed and 300 available angle of speedometer
@@ -561,39 +1248,49 @@ class _DashBoardContolsDesign(QWidget):
         self.accelerator_color_lst = (QColor(67, 13, 13, 200), QGradient(QGradient.Preset.FruitBlend))
 
     def set_speed(self, val):
-        self.speed = round(val/self.speed_angle_factor) if round(val/self.speed_angle_factor)<=300 else 300
-        self.repaint()
+        self.move_needle("speed", round(val/self.speed_angle_factor) if round(val/self.speed_angle_factor)<=300 else 300)
+        self.needle_inputs["speed"] = (val, (self.needle_target("speed"), self.speed_angle_factor))
+        self.update(self.speedometer_rect())
+        self.start_speed_motion()
+        self.record_history()
 
     def get_speed(self):
         return round(self.speed*self.speed_angle_factor)
 
     def set_accelerator_state(self, val):
+        if self.accelerator_state != val:
+            self.update(self.accelerator_rect())
         self.accelerator_state = val
-        if self.speed <= 300 and not self.break_state:
-            self.speed += self.speed_angle_factor
-            self.repaint()
+        self.start_speed_motion()
+
+    def accelerator_rect(self):
+        accelerator_rect = self.text_rect("ACCELERATE", round(self.width()*0.031))
+        accelerator_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.3, self.rect().height()*0.3).toPoint())
+        return self.dirty_rect(QRectF(accelerator_rect))
     
     def accelerator_painting(self, painter: QPainter):
-        # setting accelerator font
-        accelerator_font = QFont("Consolas", 0, 0, True)
-        accelerator_font.setPixelSize(round(self.width()*0.031))
-        accelerator_fm = QFontMetrics(accelerator_font)
-        accelerator_rect = accelerator_fm.boundingRect("ACCELERATE")
-        painter.setFont(accelerator_font)
+        # setting accelerator text
+        accelerator_font_size = round(self.width()*0.031)
+        accelerator_rect = self.text_rect("ACCELERATE", accelerator_font_size)
 
         accelerator_rect.moveTo(self.rect().center()+QPointF(self.rect().width()*0.3, self.rect().height()*0.3).toPoint())
 
-        painter.setPen(QPen(self.accelerator_color_lst[self.accelerator_state], round(self.width()*0.0025)))
-        painter.drawText(accelerator_rect, Qt.AlignmentFlag.AlignCenter, "ACCELERATE")
+        accelerator_pen = self.state_pen("accelerator", self.accelerator_color_lst, self.accelerator_state, round(self.width()*0.0025))
+        self.static_text_painting(painter, ("accelerator", self.accelerator_state), accelerator_rect, "ACCELERATE", accelerator_font_size, accelerator_pen)
 
     def speedometer_properties(self):
-        self.speedometer_bounding_rect = QRectF(self.width()*0.173, self.height()*1.01, self.width()*0.4, self.width()*0.4)
-        
         self.enable_speedometer_resetter = True
 
-        self.speedometer_resetter_timer = QTimer()
-        self.speedometer_resetter_timer.timeout.connect(self.speedometer_resetter)
-        self.speedometer_resetter_timer.start(5)
+        # speed change rates in km/h per second
+        self.accelerate_rate = 90
+        self.decelerate_rate = 90
+        self.break_rate = 270
+
+        # runs only while speed is changing
+        self.speed_motion_clock = QElapsedTimer()
+        self.speed_motion_timer = QTimer(self)
+        self.speed_motion_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.speed_motion_timer.timeout.connect(self.speed_motion)
 
         self.speed_range = 200
         self.for_loop_count = self.speed_range//20 + 2
@@ -602,11 +1299,23 @@ class _DashBoardContolsDesign(QWidget):
         self.compromise_angle_half = self.compromise_angle+self.angle_to_rotate/2
         self.enable_sub_number = True
 
+    def speedometer_geometry(self):
+        self.speedometer_bounding_rect = QRectF(self.width()*0.173, self.height()*1.01, self.width()*0.4, self.width()*0.4)
+        self.place_speedometer(self.speedometer_top)
+
+    def place_speedometer(self, top):
+        # top of speedometer as part of height
+        self.speedometer_top = top
+        self.speedometer_bounding_rect.moveTop(round(self.height()*top))
+
     def set_speedometer_range(self, top_speed):
+        speed_range = self.speed_range
         if 40 <= top_speed <= 400:
             self.speed_range = int(top_speed-top_speed%-20 if top_speed%20>=10 else top_speed-top_speed%20)
         elif top_speed < 40: self.speed_range = 40
         elif top_speed > 400: self.speed_range = 400
+        if self.speed_range == speed_range:
+            return
 
         self.speed_angle_factor = self.speed_range/300
         self.for_loop_count = self.speed_range//20 + 2
@@ -614,24 +1323,44 @@ class _DashBoardContolsDesign(QWidget):
         self.compromise_angle = 30-self.angle_to_rotate
         self.compromise_angle_half = self.compromise_angle+self.angle_to_rotate/2
         self.enable_sub_number = True if self.speed_range<=260 else False
-        self.repaint()
+        self.update(self.speedometer_rect())
 
     def set_speedometer_resetter_state(self, val):
         self.enable_speedometer_resetter = val
-
-    def speedometer_resetter(self):
-        if self.speed>0 and self.enable_speedometer_resetter:
-            if not self.accelerator_state: # accelerator released
-                if self.break_state: # break presssed
-                    self.speed -= 3*self.speed_angle_factor
-                else: 
-                    self.speed -= self.speed_angle_factor
-            if self.break_state: # break presssed
-                self.speed -= 2*self.speed_angle_factor
-            if self.speed<0: self.speed = 0
-            self.repaint()
-
-    def speedometer_painting(self, painter: QPainter):
+        self.start_speed_motion()
+
+    def set_speedometer_rates(self, accelerate_rate, decelerate_rate, break_rate):
+        self.accelerate_rate = accelerate_rate
+        self.decelerate_rate = decelerate_rate
+        self.break_rate = break_rate
+
+    def speed_rate(self):
+        """Current speed change in km/h per second, 0 when speed will not change"""
+        speed = self.needle_target("speed")  # with needle smoothing the needle follows the moving target
+        resetting = self.enable_speedometer_resetter and speed > 0
+        if self.break_state: # break presssed
+            return -self.break_rate if resetting else 0
+        if self.accelerator_state:
+            return self.accelerate_rate if speed < 300 else 0
+        return -self.decelerate_rate if resetting else 0 # accelerator released
+
+    def start_speed_motion(self):
+        if self.speed_rate() and not self.speed_motion_timer.isActive():
+            self.speed_motion_clock.start()
+            self.speed_motion_timer.start(_FRAME_INTERVAL)
+
+    def speed_motion(self):
+        # integrating over the real elapsed time, so timer jitter does not change the rates
+        elapsed = self.speed_motion_clock.restart()/1000
+        rate = self.speed_rate()
+        if rate:
+            self.move_needle("speed", min(max(self.needle_target("speed") + rate*elapsed/self.speed_angle_factor, 0), 300))
+            self.update(self.speedometer_rect())
+            self.record_history()
+        if not self.speed_rate():
+            self.speed_motion_timer.stop()
+
+    def speedometer_dial_painting(self, painter: QPainter):
         # inner dial design
         conicalGradient = QConicalGradient(QPointF(self.speedometer_bounding_rect.width()/2, self.speedometer_bounding_rect.width()/2), -59*16)
         conicalGradient.setColorAt(0.2, QColorConstants.Green)
@@ -644,14 +1373,12 @@ class _DashBoardContolsDesign(QWidget):
         painter.drawArc(inner_dial, -59*16, 298*16)
 
         # setting number font
-        number_font = QFont("Consolas", 0, 0, True)
-        number_font.setPixelSize(round(self.width()*0.02))
-        number_fm = QFontMetrics(number_font)
-        number_rect = number_fm.boundingRect("000")
-        painter.setFont(number_font)
+        number_font_size = round(self.width()*0.02)
+        number_rect = self.text_rect("000", number_font_size)
+        painter.setFont(self.consolas_font(number_font_size))
 
         # drawing main number and spike
-        painter.setPen(QPen(QGradient(QGradient.Preset.FebruaryInk), self.width()*0.005))
+        painter.setPen(self.preset_pen(QGradient.Preset.FebruaryInk, self.width()*0.005))
         center = self.speedometer_bounding_rect.center()
         painter.save()
         painter.translate(center.x(), center.y())
@@ -677,9 +1404,8 @@ class _DashBoardContolsDesign(QWidget):
         painter.restore()
 
         # drawing sub number and spike
-        painter.setPen(QPen(QGradient(QGradient.Preset.FebruaryInk), self.width()*0.003))
-        number_font.setPixelSize(round(self.width()*0.015))
-        painter.setFont(number_font)
+        painter.setPen(self.preset_pen(QGradient.Preset.FebruaryInk, self.width()*0.003))
+        painter.setFont(self.consolas_font(round(self.width()*0.015)))
         painter.save()
         painter.translate(center.x(), center.y())
         painter.rotate(self.compromise_angle_half)
@@ -704,57 +1430,76 @@ class _DashBoardContolsDesign(QWidget):
                 painter.restore()
         painter.restore()
 
-        # drawing hand
-        painter.setPen(QPen(QGradient(QGradient.Preset.Blessing), round(self.width()*0.003), cap=Qt.PenCapStyle.RoundCap))
-        painter.setBrush(QBrush(QGradient(QGradient.Preset.Blessing)))
-        hand_polygon = (center + QPoint(0, round(self.height()*0.0055)), center + QPoint(0, -round(self.height()*0.0055)), center + QPoint(round(self.height()*0.28), 0))
-        painter.save()
-        painter.translate(center.x(), center.y())
-        painter.rotate(120+self.speed)
-        painter.translate(-center.x(), -center.y())
-        painter.drawPolygon(hand_polygon)
-        painter.restore()
-
-        # drawing center point
-        painter.setPen(QPen(QGradient(QGradient.Preset.CrystalRiver), round(self.width()*0.03), cap=Qt.PenCapStyle.RoundCap))
-        painter.drawPoint(center)
-
         # drawing outer dial
-        painter.setPen(QPen(QGradient(QGradient.Preset.CrystalRiver), self.width()*0.005))
+        painter.setPen(self.preset_pen(QGradient.Preset.CrystalRiver, self.width()*0.005))
         painter.drawArc(self.speedometer_bounding_rect.toRect(), -60*16, 300*16)
 
-        # drawing speed in word
-        painter.setPen(QPen(QGradient(QGradient.Preset.Crystalline), self.width()*0.005))
-        speed_font = QFont("Consolas", 0, 0, True)
-        speed_font.setPixelSize(round(self.width()*0.035))
-        speed_fm = QFontMetrics(speed_font)
-        # speed hm/h
-        speed_kmph_rect = speed_fm.boundingRect("000-km/h")
-        painter.setFont(speed_font)
+        # drawing speed word
+        painter.setPen(self.preset_pen(QGradient.Preset.Crystalline, self.width()*0.005))
+        speed_font_size = round(self.width()*0.035)
+        speed_word_rect = self.text_rect("SPEED", speed_font_size)
+        speed_word_rect.moveCenter(center.toPoint())
+        speed_word_rect.moveBottom(round(self.speedometer_bounding_rect.bottom()-self.text_rect("000-km/h", speed_font_size).height()))
+        painter.setFont(self.consolas_font(speed_font_size))
+        painter.drawText(speed_word_rect, Qt.AlignmentFlag.AlignCenter, "SPEED")
+
+    def speedometer_rect(self):
+        return self.dirty_rect(self.speedometer_bounding_rect)
+
+    def speedometer_painting(self, painter: QPainter):
+        # drawing dial, numbers and spikes from cached layer
+        layer_rect = self.speedometer_rect()
+        self.static_layer_painting(painter, "speedometer", layer_rect, self.speedometer_dial_painting)
+
+        self.speed_hand_painting(painter)
+
+        # drawing speed in km/h
+        center = self.speedometer_bounding_rect.center()
+        painter.setPen(self.preset_pen(QGradient.Preset.Crystalline, self.width()*0.005))
+        speed_font_size = round(self.width()*0.035)
+        speed_kmph_rect = self.text_rect("000-km/h", speed_font_size)
+        painter.setFont(self.consolas_font(speed_font_size))
         speed_kmph_rect.moveCenter(center.toPoint())
         speed_kmph_rect.moveBottom(round(self.speedometer_bounding_rect.bottom()))
         painter.drawText(speed_kmph_rect, Qt.AlignmentFlag.AlignCenter, f'{self.get_speed()} km/h')
-        # speed
-        speed_word_rect = speed_fm.boundingRect("SPEED")
-        painter.setFont(speed_font)
-        speed_word_rect.moveCenter(center.toPoint())
-        speed_word_rect.moveBottom(round(self.speedometer_bounding_rect.bottom()-speed_kmph_rect.height()))
-        painter.drawText(speed_word_rect, Qt.AlignmentFlag.AlignCenter, "SPEED")
+
+    def speed_hand(self):
+        """Returns center, polygon, pen and brush of speed hand before rotation"""
+        center = self.speedometer_bounding_rect.center()
+        hand_pen = self.preset_pen(QGradient.Preset.Blessing, round(self.width()*0.003), cap=Qt.PenCapStyle.RoundCap)
+        hand_brush = self.preset_brush(QGradient.Preset.Blessing)
+        hand_polygon = (center + QPoint(0, round(self.height()*0.0055)), center + QPoint(0, -round(self.height()*0.0055)), center + QPoint(round(self.height()*0.28), 0))
+        return center, hand_polygon, hand_pen, hand_brush
+
+    def speed_hand_painting(self, painter: QPainter):
+        # drawing hand
+        center, hand_polygon, hand_pen, hand_brush = self.speed_hand()
+        self.needle_painting(painter, "speed", center, 120+self.speed, hand_polygon, hand_pen, hand_brush)
+
+        # drawing center point
+        painter.setPen(self.preset_pen(QGradient.Preset.CrystalRiver, round(self.width()*0.03), cap=Qt.PenCapStyle.RoundCap))
+        painter.drawPoint(center)
 
     def battery_properties(self):
         self.set_battery(100)
 
     def set_battery(self, val):
-        self.battery = 100-round(val/0.555) if round(val/0.555)<=180 else 180
-        self.repaint()
+        self.move_needle("battery", 100-round(val/0.555) if round(val/0.555)<=180 else 180)
+        self.needle_inputs["battery"] = (val, (self.needle_target("battery"), self.speed_angle_factor))
+        self.update(self.battery_indicator_rect())
+        self.record_history()
 
     def get_battery(self):
         return 56-round(self.battery*0.555)
 
-    def battery_indicator_painting(self, painter):
+    def get_battery_bounding_rect(self):
         battery_bounding_rect = self.speedometer_bounding_rect.toRect()
         battery_bounding_rect.setSize(QSizeF(battery_bounding_rect.width()*0.8, battery_bounding_rect.width()*0.8).toSize())
         battery_bounding_rect.moveBottomLeft(self.speedometer_bounding_rect.toRect().bottomRight()-QPoint(round(battery_bounding_rect.width()*0.2), 0))
+        return battery_bounding_rect
+
+    def battery_dial_painting(self, painter: QPainter):
+        battery_bounding_rect = self.get_battery_bounding_rect()
 
         # inner dial
         inner_dial = QRect(*battery_bounding_rect.getRect())
@@ -768,14 +1513,12 @@ class _DashBoardContolsDesign(QWidget):
         painter.drawArc(inner_dial, 121*16, -104*16)
 
         # setting number font
-        number_font = QFont("Consolas", 0, 0, True)
-        number_font.setPixelSize(round(self.width()*0.02))
-        number_fm = QFontMetrics(number_font)
-        number_rect = number_fm.boundingRect("000")
-        painter.setFont(number_font)
+        number_font_size = round(self.width()*0.02)
+        number_rect = self.text_rect("000", number_font_size)
+        painter.setFont(self.consolas_font(number_font_size))
 
         # drawing main number and spike
-        painter.setPen(QPen(QGradient(QGradient.Preset.FebruaryInk), self.width()*0.005))
+        painter.setPen(self.preset_pen(QGradient.Preset.FebruaryInk, self.width()*0.005))
         center = battery_bounding_rect.center()
         painter.save()
         painter.translate(center.x(), center.y())
@@ -800,166 +1543,250 @@ class _DashBoardContolsDesign(QWidget):
             painter.restore()
         painter.restore()
 
-        # drawing hand
-        painter.setPen(QPen(QGradient(QGradient.Preset.AmyCrisp), round(self.width()*0.003), cap=Qt.PenCapStyle.RoundCap, join=Qt.PenJoinStyle.RoundJoin))
-        painter.setBrush(QBrush(QGradient(QGradient.Preset.AmyCrisp)))
-        hand_polygon = (center+QPoint(0, round(self.height()*0.0045)), center+QPoint(0, -round(self.height()*0.0045)), center+QPoint(round(self.height()*0.22), 0))
-        painter.save()
-        painter.translate(center.x(), center.y())
-        painter.rotate(-43+self.battery)
-        painter.translate(-center.x(), -center.y())
-        painter.drawPolygon(hand_polygon)
-        painter.restore()
-
-        # drawing center point
-        painter.setPen(QPen(QColorConstants.Svg.lemonchiffon, round(self.width()*0.02), cap=Qt.PenCapStyle.RoundCap))
-        painter.drawPoint(center)
-        
         # drawing outer dial
         painter.setPen(QPen(QColorConstants.Svg.lemonchiffon, self.width()*0.005))
         painter.drawArc(battery_bounding_rect, 303*16, 190*16)
 
         # once again drawing outer dial of speedometer to hide overlap
-        painter.setPen(QPen(QGradient(QGradient.Preset.CrystalRiver), self.width()*0.005))
+        painter.setPen(self.preset_pen(QGradient.Preset.CrystalRiver, self.width()*0.005))
         painter.drawArc(self.speedometer_bounding_rect.toRect(), -60*16, 300*16)
 
-        # drawing battery percent in word
-        painter.setPen(QPen(QGradient(QGradient.Preset.CrystalRiver), self.width()*0.005))
-        battery_font = QFont("Consolas", 0, 0, True)
-        battery_font.setPixelSize(round(self.width()*0.035))
-        battery_fm = QFontMetrics(battery_font)
-        # battery percent
-        battery_percent_rect = battery_fm.boundingRect("000%")
-        painter.setFont(battery_font)
-        battery_percent_rect.moveCenter(center)
-        battery_percent_rect.moveBottom(battery_bounding_rect.bottom())
-        battery_percent_rect.moveLeft(round(battery_bounding_rect.x()+battery_bounding_rect.width()*0.23))
-        painter.drawText(battery_percent_rect, Qt.AlignmentFlag.AlignCenter, f'{self.get_battery()}%')
-        # battery
-        battery_word_rect = battery_fm.boundingRect("BATTERY")
-        painter.setFont(battery_font)
+        # drawing battery word
+        painter.setPen(self.preset_pen(QGradient.Preset.CrystalRiver, self.width()*0.005))
+        battery_font_size = round(self.width()*0.035)
+        battery_word_rect = self.text_rect("BATTERY", battery_font_size)
         battery_word_rect.moveCenter(center)
-        battery_word_rect.moveBottom(battery_bounding_rect.bottom()-battery_percent_rect.height())
+        battery_word_rect.moveBottom(battery_bounding_rect.bottom()-self.text_rect("000%", battery_font_size).height())
         battery_word_rect.moveLeft(round(battery_bounding_rect.x()+battery_bounding_rect.width()*0.15))
+        painter.setFont(self.consolas_font(battery_font_size))
         painter.drawText(battery_word_rect, Qt.AlignmentFlag.AlignCenter, "BATTERY")
 
-    def start_up_animation(self):
-        self.other_visible = False
+    def battery_indicator_rect(self):
+        return self.dirty_rect(QRectF(self.get_battery_bounding_rect()))
 
-        indicator_animation = QVariantAnimation(self)
-        indicator_animation.setStartValue(self.width())
-        indicator_animation.setEndValue(round(self.width()*0.03))
-        indicator_animation.valueChanged.connect(self.indicator_animation)
-        indicator_animation.setDuration(500)
-
-        header_animation = QVariantAnimation(self)
-        header_animation.setStartValue(0)
-        header_animation.setEndValue(round(self.scaled_header_border.boundingRect().height()))
-        header_animation.valueChanged.connect(self.header_animation)
-        header_animation.setDuration(300)
-
-        speedometer_popup_animation = QVariantAnimation(self)
-        speedometer_popup_animation.setStartValue(round(self.height()*1.01))
-        speedometer_popup_animation.setEndValue(round(self.height()*0.2))
-        speedometer_popup_animation.valueChanged.connect(self.speedometer_popup_animation)
-        speedometer_popup_animation.finished.connect(self.other_popup_animation)
-        speedometer_popup_animation.setDuration(500)
-
-        speedometer_animation1 = QVariantAnimation(self)
-        speedometer_animation1.setStartValue(0)
-        speedometer_animation1.setEndValue(300)
-        speedometer_animation1.valueChanged.connect(self.speedometer_animation)
-        speedometer_animation1.setDuration(1000)
-
-        speedometer_animation2 = QVariantAnimation(self)
-        speedometer_animation2.setStartValue(300)
-        speedometer_animation2.setEndValue(0)
-        speedometer_animation2.valueChanged.connect(self.speedometer_animation)
-        speedometer_animation2.setDuration(1000)
-
-        check_all_state_animation = QVariantAnimation(self)
-        check_all_state_animation.currentLoopChanged.connect(self.check_all_state_animation)
-        check_all_state_animation.setDuration(200)
-        check_all_state_animation.setLoopCount(10)
-
-        sa_speeddial_group = QSequentialAnimationGroup(self)
-        sa_speeddial_group.addAnimation(speedometer_animation1)
-        sa_speeddial_group.insertPause(1, 50)
-        sa_speeddial_group.addAnimation(speedometer_animation2)
-
-        pa_group = QParallelAnimationGroup(self)
-        pa_group.addAnimation(check_all_state_animation)
-        pa_group.addAnimation(sa_speeddial_group)
-
-        sa_group = QSequentialAnimationGroup(self)
-        sa_group.addAnimation(indicator_animation)
-        sa_group.addAnimation(header_animation)
-        sa_group.addAnimation(speedometer_popup_animation)
-        sa_group.addAnimation(pa_group)
-        sa_group.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
-
-    def indicator_animation(self, pos):
-        self.scaled_header_border.translate(0, -self.scaled_header_border.boundingRect().y()-self.scaled_header_border.boundingRect().height())
-        self.scaled_header_inner.translate(0, -self.scaled_header_inner.boundingRect().y()-self.scaled_header_border.boundingRect().height())
-        # left indicator
-        self.scaled_left_idicator.translate(-self.scaled_left_idicator.boundingRect().x(), -self.scaled_left_idicator.boundingRect().y())
-        self.scaled_left_idicator.translate(pos, self.height()*0.06)
-        # right indicator
-        self.scaled_right_idicator.translate(-self.scaled_right_idicator.boundingRect().x(), -self.scaled_right_idicator.boundingRect().y())
-        self.scaled_right_idicator.translate(self.width()-self.scaled_right_idicator.boundingRect().width()-self.scaled_left_idicator.boundingRect().x(), self.height()*0.06)
-        self.repaint()
+    def battery_indicator_painting(self, painter):
+        battery_bounding_rect = self.get_battery_bounding_rect()
 
-    def header_animation(self, pos):
-        self.scaled_header_border.translate(0, -self.scaled_header_border.boundingRect().y()-self.scaled_header_border.boundingRect().height())
-        self.scaled_header_inner.translate(0, -self.scaled_header_inner.boundingRect().y()-self.scaled_header_border.boundingRect().height())
-        self.scaled_header_border.translate(0, pos)
-        self.scaled_header_inner.translate(0, pos)
-        self.repaint()
+        # drawing dial, numbers and spikes from cached layer, including overlapped speedometer outer dial
+        layer_rect = self.battery_indicator_rect().united(self.speedometer_rect())
+        self.static_layer_painting(painter, "battery", layer_rect, self.battery_dial_painting)
 
-    def speedometer_popup_animation(self, pos):
-        self.speedometer_bounding_rect.moveTop(pos)
-        self.repaint()
+        # drawing hand
+        center = battery_bounding_rect.center()
+        hand_pen = self.preset_pen(QGradient.Preset.AmyCrisp, round(self.width()*0.003), cap=Qt.PenCapStyle.RoundCap, join=Qt.PenJoinStyle.RoundJoin)
+        hand_brush = self.preset_brush(QGradient.Preset.AmyCrisp)
+        hand_polygon = (center+QPoint(0, round(self.height()*0.0045)), center+QPoint(0, -round(self.height()*0.0045)), center+QPoint(round(self.height()*0.22), 0))
+        self.needle_painting(painter, "battery", QPointF(center), -43+self.battery, hand_polygon, hand_pen, hand_brush)
 
-    def other_popup_animation(self):
-        self.other_visible = True
-        self.repaint()
-
-    def speedometer_animation(self, val):
-        self.speed = val
-        self.repaint()
-
-    def check_all_state_animation(self, loop_count):
-        if loop_count == 1:
-            self.show_time = 1
-        elif loop_count == 2:
-            self.left_indicator_color = self.indicator_color_list[1]
-        elif loop_count == 3:
-            self.left_indicator_color = self.indicator_color_list[0]
-            self.header_border_color = 1
-        elif loop_count == 4:
-            self.header_border_color = 0
-            self.right_indicator_color = self.indicator_color_list[1]
-        elif loop_count == 5:
-            self.right_indicator_color = self.indicator_color_list[0]
-            self.set_horn_state(1)
-        elif loop_count == 6:
-            self.set_horn_state(0)
-            self.charge_state = 1
-        elif loop_count == 7:
-            if not self.charge_default_state:
-                self.charge_state = 0
-            self.break_state = 1
-        elif loop_count == 8:
-            self.break_state = 0
-            self.accelerator_state = 1
-        elif loop_count == 9:
-            self.accelerator_state = 0
-        self.repaint()
+        # drawing center point
+        painter.setPen(QPen(QColorConstants.Svg.lemonchiffon, round(self.width()*0.02), cap=Qt.PenCapStyle.RoundCap))
+        painter.drawPoint(center)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHints(_RENDER_HINTS, True)
+        # drawing battery percent in word
+        painter.setPen(self.preset_pen(QGradient.Preset.CrystalRiver, self.width()*0.005))
+        battery_font_size = round(self.width()*0.035)
+        battery_percent_rect = self.text_rect("000%", battery_font_size)
+        painter.setFont(self.consolas_font(battery_font_size))
+        battery_percent_rect.moveCenter(center)
+        battery_percent_rect.moveBottom(battery_bounding_rect.bottom())
+        battery_percent_rect.moveLeft(round(battery_bounding_rect.x()+battery_bounding_rect.width()*0.23))
+        painter.drawText(battery_percent_rect, Qt.AlignmentFlag.AlignCenter, f'{self.get_battery()}%')
 
+    def set_trip_computer(self, trip_computer):
+        self.trip_computer = trip_computer
+        self.trip_text = ()
+        self.trip_update()
+        self.update(self.trip_rect())
+
+    def trip_update(self):
+        # once a second with the clock, painted again only when the shown text changes
+        if self.trip_computer is None:
+            return
+        values = self.trip_computer.values(time.monotonic())
+        consumption, range_km = values["consumption_wh_per_km"], values["range_km"]
+        trip_text = (f"TRIP  {values['distance_km']:.1f} km", f"AVG   {values['average_speed']:.0f} km/h",
+                     "USE   --" if consumption is None else f"USE   {consumption:.0f} Wh/km",
+                     "RANGE --" if range_km is None else f"RANGE {range_km:.0f} km")
+        if trip_text != self.trip_text:
+            self.trip_text = trip_text
+            self.update(self.trip_rect())
+
+    def trip_rect(self):
+        # left of speedometer (its rim starts at 0.173 of width), below indicator
+        return QRectF(self.width()*0.02, self.height()*0.25, self.width()*0.145, self.height()*0.22).toAlignedRect()
+
+    def trip_painting(self, painter: QPainter):
+        trip_rect = self.trip_rect()
+        # font made smaller when a long value would not fit beside the speedometer
+        font_size = round(self.width()*0.015)
+        while font_size > 1 and max(self.font_metrics(font_size).horizontalAdvance(text) for text in self.trip_text) > trip_rect.width():
+            font_size -= 1
+        painter.setFont(self.consolas_font(font_size))
+        painter.setPen(self.preset_pen(QGradient.Preset.FreshOasis, round(self.width()*0.0012)))
+        line_height = trip_rect.height()/len(self.trip_text)
+        for line, text in enumerate(self.trip_text):
+            line_rect = QRectF(trip_rect.x(), trip_rect.y()+line*line_height, trip_rect.width(), line_height)
+            painter.drawText(line_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+    def performance_properties(self):
+        self.performance_overlay_visible = False
+        self.performance_text = ""
+        self.command_queues = []  # of controls attached to this dashboard
+        self.unpainted_input_time = None  # oldest applied input not yet painted
+        self.reset_performance_counters()
+
+        self.performance_timer = QTimer(self)
+        self.performance_timer.timeout.connect(self.performance_update)
+
+    def reset_performance_counters(self):
+        self.paint_count = 0
+        self.paint_time_total = 0
+        self.paint_time_worst = 0
+        self.latency_count = 0
+        self.latency_total = 0
+        self.latency_worst = 0
+
+    def set_performance_overlay_visible(self, val):
+        self.performance_overlay_visible = bool(val)
+        self.reset_performance_counters()
+        self.unpainted_input_time = None
+        if val:
+            self.performance_text = "measuring..."
+            self.performance_timer.start(1000)
+        else:
+            self.performance_timer.stop()
+        self.update(self.performance_rect())
+
+    def input_applied(self, input_time):
+        if self.unpainted_input_time is None:
+            self.unpainted_input_time = input_time
+
+    def performance_update(self):
+        # once per second while overlay is shown
+        paint_avg = self.paint_time_total/self.paint_count if self.paint_count else 0
+        latency_avg = self.latency_total/self.latency_count if self.latency_count else 0
+        self.performance_text = (f"{self.paint_count} paints/s avg {paint_avg*1000:.2f} worst {self.paint_time_worst*1000:.2f} ms\n"
+                                f"input to pixel avg {latency_avg*1000:.1f} worst {self.latency_worst*1000:.1f} ms\n"
+                                f"queued state changes {sum(len(queue) for queue in self.command_queues)}  quality {self.quality_tier}")
+        self.reset_performance_counters()
+        self.update(self.performance_rect())
+
+    def performance_rect(self):
+        return QRectF(self.width()*0.005, self.height()*0.89, self.width()*0.27, self.height()*0.105).toAlignedRect()
+
+    def performance_painting(self, painter: QPainter):
+        painter.setFont(self.consolas_font(max(round(self.width()*0.011), 8), italic=False))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 160))
+        painter.drawRect(self.performance_rect())
+        painter.setPen(QColorConstants.Svg.lime)
+        painter.drawText(self.performance_rect().adjusted(4, 2, -4, -2), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.performance_text)
+
+    def start_up_properties(self):
+        self.start_up_speed = 1.0  # factor of timeline time to real time
+        self.start_up_time = 0  # ms of timeline played
+        self.start_up_applied = {}  # step track -> value applied last
+        self.start_up_clock = QElapsedTimer()
+        self.start_up_timer = QTimer(self)
+        self.start_up_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.start_up_timer.timeout.connect(self.start_up_frame)
+
+        # step track -> function applying its value without painting, start_up_frame() paints once
+        self.start_up_steps = {
+            "other_visible": lambda val: setattr(self, "other_visible", bool(val)),
+            "show_time": lambda val: setattr(self, "show_time", val),
+            "left_indicator_lit": lambda val: setattr(self, "left_indicator_lit", val),
+            "right_indicator_lit": lambda val: setattr(self, "right_indicator_lit", val),
+            "header_border_color": lambda val: setattr(self, "header_border_color", val),
+            "horn_state": self.start_up_horn,
+            "charge_lit": lambda val: setattr(self, "charge_state", val or self.charge_default_state),
+            "break_state": lambda val: setattr(self, "break_state", val),
+            "accelerator_state": lambda val: setattr(self, "accelerator_state", val),
+        }
+
+    def start_up_horn(self, val):
+        self.horn_sound_color_idx = val
+        self.horn_state = val
+
+    def set_start_up_animation_speed(self, factor):
+        self.start_up_speed = factor
+
+    def start_up_animation(self):
+        self.start_up_time = 0
+        self.start_up_applied = {}
+        self.start_up_clock.start()
+        self.start_up_timer.start(_FRAME_INTERVAL)
+        self.start_up_frame()
+
+    def start_up_frame(self):
+        # one composed state of all tracks per display frame, drawn by one paint
+        self.start_up_time = min(self.start_up_time + self.start_up_clock.restart()*self.start_up_speed, _START_UP_DURATION)
+        self.apply_start_up_motion(self.start_up_time)
+        self.apply_start_up_steps(self.start_up_time, _START_UP_STEPS)
+        if self.start_up_time >= _START_UP_DURATION:
+            self.start_up_timer.stop()
+        self.update()
+
+    def apply_start_up_motion(self, time):
+        self.place_indicators(_keyframe_value(_START_UP_MOTION["indicator_x"], time))
+        self.place_header(_keyframe_value(_START_UP_MOTION["header_shown"], time))
+        self.place_speedometer(_keyframe_value(_START_UP_MOTION["speedometer_top"], time))
+        self.speed = round(_keyframe_value(_START_UP_MOTION["speed"], time))
+
+    def apply_start_up_steps(self, time, tracks):
+        # a step value is applied once, when it changes, so states set meanwhile are not overwritten every frame
+        for track in tracks:
+            val = _keyframe_value(_START_UP_STEPS[track], time, interpolate=False)
+            if val is not None and val != self.start_up_applied.get(track):
+                self.start_up_steps[track](val)
+                self.start_up_applied[track] = val
+
+    def skip_start_up_animation(self):
+        # final state of start_up_animation(), also when it is stopped mid way
+        self.start_up_timer.stop()
+        self.start_up_time = _START_UP_DURATION
+        self.apply_start_up_motion(_START_UP_DURATION)
+        self.apply_start_up_steps(_START_UP_DURATION, tuple(self.start_up_applied))  # undoing only steps already played
+        self.show_time = 1
+        self.other_visible = True
+        self.update()
+
+    def dirty_rect(self, rect: QRectF):
+        """Aligned rect of a component grown by the widest pen used, for partial update"""
+        margin = round(self.width()*0.01)
+        return rect.toAlignedRect().adjusted(-margin, -margin, margin, margin)
+
+    def current_state(self):
+        # values needles are converging to, a value given again is not dropped as already shown
+        speed, battery = self.needle_target("speed"), self.needle_target("battery")
+        state = {"speed": round(speed*self.speed_angle_factor), "battery": 56-round(battery*0.555), "accelerator_state": self.accelerator_state,
+                 "break_state": self.break_state, "horn_state": self.horn_state, "charge_state": self.charge_default_state,
+                 "left_indicator_state": self.left_indicator_state, "right_indicator_state": self.right_indicator_state}
+        # needle angles do not give back every input exactly, so last input is kept while its needle target is not moved
+        for name, (val, shown) in tuple(self.needle_inputs.items()):  # also read by producer threads
+            if shown == (self.needle_target(name), self.speed_angle_factor):
+                state[name] = val
+        return state
+
+    def set_history(self, history):
+        self.history = history
+        self.record_history()  # starting from the shown state
+
+    def record_history(self):
+        # shown speed, battery and break, so speed changed by speed motion is recorded too
+        if self.history is not None:
+            self.history.append(self.needle_target("speed")*self.speed_angle_factor, 56-round(self.needle_target("battery")*0.555), self.break_state)
+
+    def apply_state(self, state: dict):
+        """Apply several fields at once, the updated rects are merged into one paint"""
+        setters = {"speed": self.set_speed, "battery": self.set_battery, "accelerator_state": self.set_accelerator_state,
+                    "break_state": self.set_break_state, "horn_state": self.set_horn_state, "charge_state": self.set_charge_state,
+                    "left_indicator_state": lambda val: self.set_indicator_state(0, val),
+                    "right_indicator_state": lambda val: self.set_indicator_state(1, val)}
+        for field, val in state.items():
+            setters[field](val)
+
+    def background_painting(self, painter: QPainter):
         linearGradient = QLinearGradient(self.rect().topLeft(), self.rect().bottomRight())
         linearGradient.setColorAt(0.2, QColor(0, 0, 0))
         linearGradient.setColorAt(0.7, QColor(16,0,0))
@@ -968,42 +1795,220 @@ class _DashBoardContolsDesign(QWidget):
         painter.setBrush(linearGradient)
         painter.drawRect(self.rect())
 
-        self.header_painting(painter)
-        self.indicators_painting(painter)
+    def size_cache(self):
+        """Cache shared with other dashboards of the current size"""
+        cache = self.held_size_cache[0]
+        if cache is None or cache.size_key != (self.width(), self.height()):
+            new_cache = _SizeCache.acquire((self.width(), self.height()))
+            if cache is not None:
+                cache.release()
+            cache = self.held_size_cache[0] = new_cache
+        return cache
+
+    def paint_resource(self, key, build_function):
+        """Returns the cached resource of key, built with build_function on first use. Resources \
+        are built once per size and quality tier and shared by dashboards of the same size"""
+        paint_resources = self.size_cache().paint_resources
+        resource = paint_resources.get((self.quality_tier, key))
+        if resource is None:
+            resource = paint_resources[(self.quality_tier, key)] = build_function()
+        return resource
+
+    def consolas_font(self, pixel_size, italic=True):
+        def build_font():
+            font = QFont("Consolas", 0, 0, italic)
+            font.setPixelSize(pixel_size)
+            return font
+        return self.paint_resource(("font", pixel_size, italic), build_font)
+
+    def font_metrics(self, pixel_size):
+        return self.paint_resource(("metrics", pixel_size), lambda: QFontMetrics(self.consolas_font(pixel_size)))
+
+    def text_rect(self, text, pixel_size):
+        """Bounding rect of text at origin, a copy which can be moved"""
+        return QRect(self.paint_resource(("text_rect", text, pixel_size), lambda: self.font_metrics(pixel_size).boundingRect(text)))
+
+    def needle_painting(self, painter: QPainter, name, center: QPointF, angle, hand_polygon, pen: QPen, brush: QBrush):
+        """Draw a hand polygon rotated by angle around center. With needle sprites enabled, the \
+        hand of each whole angle is rendered once into a pixmap and blitted, least recently used \
+        pixmaps are dropped when needle_sprite_limit is exceeded"""
+        if self.needle_sprites_enabled:
+            angle = round(angle)
+            sprite = self.needle_sprites.get((name, angle))
+            if sprite is not None:
+                self.needle_sprites.move_to_end((name, angle))
+                offset, pixmap = sprite
+                painter.drawPixmap(center+offset, pixmap)
+                return
+        hand_transform = QTransform().translate(center.x(), center.y()).rotate(angle).translate(-center.x(), -center.y())
+
+        def hand_painting(hand_painter: QPainter):
+            hand_painter.setTransform(hand_transform, True)
+            hand_painter.setPen(pen)
+            hand_painter.setBrush(brush)
+            hand_painter.drawPolygon(QPolygonF(hand_polygon))
+
+        if not self.needle_sprites_enabled:
+            painter.save()
+            hand_painting(painter)
+            painter.restore()
+            return
+
+        pen_margin = pen.widthF()
+        sprite_rect = hand_transform.map(QPolygonF(hand_polygon)).boundingRect().adjusted(-pen_margin, -pen_margin, pen_margin, pen_margin).toAlignedRect()
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap((QSizeF(sprite_rect.size())*dpr).toSize())
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        sprite_painter = QPainter(pixmap)
+        sprite_painter.setRenderHints(self.render_hints, True)
+        sprite_painter.translate(-sprite_rect.x(), -sprite_rect.y())
+        hand_painting(sprite_painter)
+        sprite_painter.end()
+
+        # position is kept relative to center, which moves while the speedometer pops up
+        self.needle_sprites[(name, angle)] = (QPointF(sprite_rect.topLeft())-center, pixmap)
+        self.needle_sprite_bytes += pixmap.width()*pixmap.height()*4
+        while self.needle_sprite_bytes > self.needle_sprite_limit and len(self.needle_sprites) > 1:
+            _, (_, old_pixmap) = self.needle_sprites.popitem(last=False)
+            self.needle_sprite_bytes -= old_pixmap.width()*old_pixmap.height()*4
+        painter.drawPixmap(sprite_rect.topLeft(), pixmap)
+
+    def static_text_painting(self, painter: QPainter, name, text_rect: QRect, text, pixel_size, pen: QPen):
+        """Draw a constant label from a cached layer, laid out and rendered once per pen. \
+        (QStaticText is not used as it ignores the bounding box of gradient pens)"""
+        def text_painting(text_painter: QPainter):
+            text_painter.setFont(self.consolas_font(pixel_size))
+            text_painter.setPen(pen)
+            text_painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
+        self.static_layer_painting(painter, name, self.dirty_rect(QRectF(text_rect)), text_painting)
+
+    def preset_pen(self, preset, width, cap=Qt.PenCapStyle.SquareCap, join=Qt.PenJoinStyle.BevelJoin):
+        return self.paint_resource(("preset_pen", preset, width, cap, join),
+                                    lambda: QPen(self.tier_brush(QGradient(preset)), width, cap=cap, join=join))
+
+    def preset_brush(self, preset):
+        return self.paint_resource(("preset_brush", preset), lambda: QBrush(self.tier_brush(QGradient(preset))))
+
+    def state_pen(self, name, color_lst, state, width, cap=Qt.PenCapStyle.SquareCap):
+        return self.paint_resource(("state_pen", name, state, width, cap),
+                                    lambda: QPen(self.tier_brush(color_lst[state]), width, cap=cap))
+
+    def static_layer_painting(self, painter: QPainter, name, rect: QRect, painting_function):
+        """Draw the parts which do not change between frames from a cached pixmap. A pixmap is \
+        painted again when layer rect, device pixel ratio, speedometer range or render quality \
+        changes, the last few pixmaps per layer name are kept and shared by dashboards of the same size"""
+        dpr = self.devicePixelRatioF()
+        key = (rect.getRect(), dpr, self.speed_range, int(self.render_hints), self.gradients_enabled, self.patterns_enabled)
+        layer_pixmaps = self.size_cache().static_layers.setdefault(name, OrderedDict())
+        pixmap = layer_pixmaps.get(key)
+        if pixmap is not None:
+            layer_pixmaps.move_to_end(key)
+        else:
+            pixmap = QPixmap((QSizeF(rect.size())*dpr).toSize())
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            layer_painter = QPainter(pixmap)
+            layer_painter.setRenderHints(self.render_hints, True)
+            layer_painter.translate(-rect.x(), -rect.y())
+            painting_function(layer_painter)
+            layer_painter.end()
+            layer_pixmaps[key] = pixmap
+            if len(layer_pixmaps) > _STATIC_LAYER_KEYS:
+                layer_pixmaps.popitem(last=False)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def update_geometry(self):
+        # polygons and rects of components for current size
+        self.geometry_size = self.size()
+        self.header_geometry()
+        self.indicators_geometry()
+        self.speedometer_geometry()
+        self.clear_needle_sprites()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.time_update()  # clock runs again, also after the window is restored from minimised
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.time_update_timer.stop()
+
+    def paintEvent(self, event):
+        measure_paint = self.performance_overlay_visible or self.auto_quality
+        if measure_paint:
+            paint_start = time.perf_counter()
+        if self.geometry_size != self.size():  # first paint after resize, intermediate resizes are skipped
+            self.update_geometry()
+        painter = QPainter(self)
+        painter.setRenderHints(self.render_hints, True)
+
+        self.static_layer_painting(painter, "background", self.rect(), self.background_painting)
+
+        # painting only the components inside the updated region
+        update_rect = event.rect()
+        if update_rect.intersects(self.header_rect()):
+            self.header_painting(painter)
+        if update_rect.intersects(self.indicators_rect()):
+            self.indicators_painting(painter)
         if self.other_visible:
-            self.horn_painting(painter)
-            self.charge_painting(painter)
-            self.break_painting(painter)
-            self.accelerator_painting(painter)
-        self.speedometer_painting(painter)
-        self.battery_indicator_painting(painter)
+            if update_rect.intersects(self.horn_rect()):
+                self.horn_painting(painter)
+            if update_rect.intersects(self.charge_rect()):
+                self.charge_painting(painter)
+            if update_rect.intersects(self.break_rect()):
+                self.break_painting(painter)
+            if update_rect.intersects(self.accelerator_rect()):
+                self.accelerator_painting(painter)
+        if update_rect.intersects(self.speedometer_rect()):
+            self.speedometer_painting(painter)
+        if update_rect.intersects(self.battery_indicator_rect().united(self.speedometer_rect())):
+            self.battery_indicator_painting(painter)
+        if self.trip_text and self.other_visible and update_rect.intersects(self.trip_rect()):
+            self.trip_painting(painter)
+
+        if measure_paint:
+            paint_end = time.perf_counter()
+            paint_time = paint_end-paint_start
+            if self.auto_quality:
+                self.adapt_quality(paint_time)
+        if self.performance_overlay_visible:
+            self.paint_count += 1
+            self.paint_time_total += paint_time
+            self.paint_time_worst = max(self.paint_time_worst, paint_time)
+            if self.unpainted_input_time is not None:
+                latency = paint_end-self.unpainted_input_time
+                self.latency_count += 1
+                self.latency_total += latency
+                self.latency_worst = max(self.latency_worst, latency)
+                self.unpainted_input_time = None
+            if update_rect.intersects(self.performance_rect()):
+                self.performance_painting(painter)
 
 
 class _DashBoardControls(QObject):
     """WARNING: This is a private class. do not import this."""
-    set_speedometer_range_sig = pyqtSignal(int)
-    accelerator_sig = pyqtSignal(int)
-    set_current_speed_signal = pyqtSignal(int)
-    set_speedometer_resetter_sig = pyqtSignal(int)
-    break_sig = pyqtSignal(int)
-    horn_sig = pyqtSignal(int)
-    indicator_sig = pyqtSignal(int)
-    set_battery_remaining_power_sig = pyqtSignal(int)
-    charging_sig = pyqtSignal(int)
+    command_sig = pyqtSignal()  # emitted when command queue gets its first command
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, dash_board=None):
         super().__init__(parent)
 
-        global _dash_board
-        
         self.required_values()
 
-        if _dash_board is not None:
-            self.dash_board = _dash_board
-            self.startup_values_setter()
-            if __name__ == "__main__":  # for install default key event if dashboard called in main thread
-                self.dash_board.installEventFilter(self.dash_board) 
-            self.all_connector()
+        if dash_board is not None:  # DashBoard widget owning this controls
+            if hasattr(dash_board, "dash_board_widget"):
+                self.attach(dash_board.dash_board_widget)
+            else:
+                dash_board.waiting_controls.append(self)  # attached in show_dashboard()
+        elif _dash_board is not None:  # last shown DashBoard widget
+            self.attach(_dash_board)
+
+    def attach(self, dash_board):
+        self.dash_board = dash_board
+        self.startup_values_setter()
+        if __name__ == "__main__":  # for install default key event if dashboard called in main thread
+            self.dash_board.installEventFilter(self.dash_board) 
+        self.all_connector()
 
     def required_values(self):
         # default keys to prevent error
@@ -1014,20 +2019,41 @@ class _DashBoardControls(QObject):
         self.creator_btn_hide = False
         self.start_skip = False
         self.loading_skip = False
+        self.start_up_animation_skip = False
+        self.start_up_animation_speed = 1.0
         self.speedometer_topspeed = 200
+        self.speedometer_rates = (90, 90, 270) # accelerate, decelerate and break in km/h per second
+        self.render_quality = ("full", 16.7)  # quality tier or "auto", frame budget in ms
+        self.needle_sprites = (False, 16)  # enabled, memory limit in MB
+        self.needle_smoothing = 0  # seconds
         self.battery_level = 100
         self.charging_state = 0 # off
+        self.command_queue = _CommandQueue()  # calls from any thread, drained by GUI thread once per frame
+        self.command_delivery_clock = QElapsedTimer()
+        self.recorder = None  # object with record(field, val) method, see recorder.py
+        self.trip_computer = _TripComputer()  # fed by every speed and battery given, in the calling thread
+        self.measure_latency = False  # while performance overlay is shown
 
     def startup_values_setter(self):
         self.keys_ = self.dash_board.keys_  # orginal keys
-        self.dash_board.dash_board_design_widget.set_speedometer_range(self.speedometer_topspeed)
-        self.dash_board.dash_board_design_widget.set_battery(self.battery_level)
-        self.dash_board.dash_board_design_widget.set_charge_state(self.charging_state)
+        design = self.dash_board.dash_board_design_widget
+        # applied in one pass without painting, a shown dashboard is painted once after it
+        design.setUpdatesEnabled(False)
+        design.set_start_up_animation_speed(self.start_up_animation_speed)
+        design.set_speedometer_range(self.speedometer_topspeed)
+        design.set_speedometer_rates(*self.speedometer_rates)
+        design.set_render_quality(*self.render_quality)
+        design.set_needle_sprites(*self.needle_sprites)
+        design.set_needle_smoothing(self.needle_smoothing)
+        design.set_battery(self.battery_level)
+        design.set_charge_state(self.charging_state)
+        design.setUpdatesEnabled(True)
 
     def launch_dashboard(self):
         app = QApplication(sys.argv)
         self.dash_board = _DashBoardMain(None, (self.dashboard_width, self.dashboard_height), \
-                                            self.creator_btn_hide, self.start_skip, self.loading_skip)
+                                            self.creator_btn_hide, self.start_skip, self.loading_skip, \
+                                            skip_start_up_animation=self.start_up_animation_skip)
         self.startup_values_setter()
         if __name__ == "__main__":  # for install default key event if dashboard called in main thread
             self.dash_board.installEventFilter(self.dash_board) 
@@ -1036,15 +2062,27 @@ class _DashBoardControls(QObject):
         app.exec()
 
     def all_connector(self):
-        self.set_speedometer_range_sig.connect(self.dash_board.dash_board_design_widget.set_speedometer_range)
-        self.accelerator_sig.connect(self.dash_board.dash_board_design_widget.set_accelerator_state)
-        self.set_current_speed_signal.connect(self.dash_board.dash_board_design_widget.set_speed)
-        self.set_speedometer_resetter_sig.connect(self.dash_board.dash_board_design_widget.set_speedometer_resetter_state)
-        self.break_sig.connect(self.dash_board.dash_board_design_widget.set_break_state)
-        self.horn_sig.connect(self.dash_board.dash_board_design_widget.set_horn_state)
-        self.indicator_sig.connect(self.dash_board.dash_board_design_widget.indicator_triger)
-        self.set_battery_remaining_power_sig.connect(self.dash_board.dash_board_design_widget.set_battery)
-        self.charging_sig.connect(self.dash_board.dash_board_design_widget.set_charge_state)
+        design = self.dash_board.dash_board_design_widget
+        design.command_queues.append(self.command_queue)
+        # command field -> function applying it in GUI thread, state fields are applied together by apply_state()
+        self.command_appliers = {
+            "hazard_lights": design.set_hazard_lights,
+            "history": design.set_history,
+            "trip_readout": lambda val: design.set_trip_computer(self.trip_computer if val else None),
+            "speedometer_range": design.set_speedometer_range,
+            "speedometer_resetter_state": design.set_speedometer_resetter_state,
+            "speedometer_rates": lambda val: design.set_speedometer_rates(*val),
+            "performance_overlay": design.set_performance_overlay_visible,
+            "render_quality": lambda val: design.set_render_quality(*val),
+            "needle_sprites": lambda val: design.set_needle_sprites(*val),
+            "needle_smoothing": design.set_needle_smoothing,
+            "start_up_animation_speed": design.set_start_up_animation_speed,
+            # skipping only a running animation, its final state is already shown otherwise
+            "start_up_animation_skip": lambda val: design.start_up_timer.isActive() and design.skip_start_up_animation(),
+        }
+        self.command_sig.connect(self.deliver_commands)
+        if len(self.command_queue):  # commands given before dashboard launched
+            self.command_sig.emit()
 
     def set_dashboard_size(self, width, height):
         self.dashboard_height = height
@@ -1059,86 +2097,267 @@ class _DashBoardControls(QObject):
     def skip_loading_screen(self, skip):
         self.loading_skip = skip
 
+    def skip_start_up_animation(self, skip):
+        self.start_up_animation_skip = skip
+        if skip: self.put_command("start_up_animation_skip", 1)
+
+    def set_start_up_animation_speed(self, factor):
+        self.start_up_animation_speed = factor
+        self.put_command("start_up_animation_speed", factor)
+
     def set_speedometer_range(self, top_speed):
         self.speedometer_topspeed = top_speed
-        self.set_speedometer_range_sig.emit(top_speed)
+        if self.recorder is not None: self.recorder.record("speedometer_range", top_speed)
+        self.put_command("speedometer_range", top_speed)
 
     def apply_accelerator(self):
-        self.keys_[Qt.Key.Key_W] = True
-        self.accelerator_sig.emit(1)
+        self.update_state({"accelerator_state": 1})
 
     def release_accelerator(self):
-        self.keys_[Qt.Key.Key_W] = False
-        self.accelerator_sig.emit(0)
+        self.update_state({"accelerator_state": 0})
 
     def set_speed(self, current_speed):
-        self.set_current_speed_signal.emit(current_speed)
+        self.update_state({"speed": current_speed})
 
     def set_speedometer_resetter_state(self, state):
-        self.set_speedometer_resetter_sig.emit(state)
+        if self.recorder is not None: self.recorder.record("speedometer_resetter_state", state)
+        self.put_command("speedometer_resetter_state", state)
+
+    def set_speedometer_rates(self, accelerate_rate, decelerate_rate, break_rate):
+        self.speedometer_rates = (accelerate_rate, decelerate_rate, break_rate)
+        self.put_command("speedometer_rates", self.speedometer_rates)
 
     def apply_break(self):
-        self.keys_[Qt.Key.Key_Space] = True
-        self.break_sig.emit(1)
+        self.update_state({"break_state": 1})
 
     def release_break(self):
-        self.keys_[Qt.Key.Key_Space] = False
-        self.break_sig.emit(0)
+        self.update_state({"break_state": 0})
 
     def sound_horn(self):
-        self.keys_[Qt.Key.Key_H] = True
-        self.horn_sig.emit(1)
+        self.update_state({"horn_state": 1})
 
     def off_horn(self):
-        self.keys_[Qt.Key.Key_H] = False
-        self.horn_sig.emit(0)
+        self.update_state({"horn_state": 0})
 
     def left_indicator_on_or_off(self):
-        self.keys_[Qt.Key.Key_Left] = True
-        self.indicator_sig.emit(0)
+        self.toggle_state("left_indicator_state")
 
     def right_indicator_on_or_off(self):
-        self.keys_[Qt.Key.Key_Right] = True
-        self.indicator_sig.emit(1)
+        self.toggle_state("right_indicator_state")
+
+    def set_hazard_lights(self, on):
+        if self.recorder is not None:
+            self.recorder.record("left_indicator_state", on)
+            self.recorder.record("right_indicator_state", on)
+        self.put_command("hazard_lights", on)  # one command, so both sides always change in the same frame
 
     def update_battery_power(self, current_battery_power):
-        self.battery_level = current_battery_power
-        self.set_battery_remaining_power_sig.emit(current_battery_power)
+        self.update_state({"battery": current_battery_power})
 
     def charging_on(self):
-        self.charging_state = 1
-        self.charging_sig.emit(1)
+        self.update_state({"charge_state": 1})
 
     def charging_off(self):
-        self.charging_state = 0
-        self.charging_sig.emit(0)
+        self.update_state({"charge_state": 0})
+
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+
+    def set_history(self, history):
+        self.put_command("history", history)
+
+    def show_trip_computer(self, show):
+        self.put_command("trip_readout", show)
+
+    def set_battery_capacity(self, capacity_kwh):
+        self.trip_computer.battery_capacity = capacity_kwh
+
+    def trip_values(self):
+        return self.trip_computer.values(time.monotonic())
+
+    def reset_trip(self):
+        self.trip_computer.reset()
+
+    def show_performance_overlay(self, show):
+        self.measure_latency = show
+        self.put_command("performance_overlay", show)
+
+    def set_render_quality(self, quality, frame_budget_ms):
+        self.render_quality = (quality, frame_budget_ms)
+        self.put_command("render_quality", self.render_quality)
+
+    def use_needle_sprites(self, enable, memory_limit_mb):
+        self.needle_sprites = (enable, memory_limit_mb)
+        self.put_command("needle_sprites", self.needle_sprites)
+
+    def set_needle_smoothing(self, smooth_time):
+        self.needle_smoothing = smooth_time
+        self.put_command("needle_smoothing", smooth_time)
+
+    def set_command_queue(self, capacity, policy):
+        self.command_queue.configure(capacity, policy)
+
+    def command_queue_counters(self):
+        return self.command_queue.counters()
+
+    def update_state(self, state: dict):
+        # keeping default values in sync for a dashboard launched later
+        if "battery" in state: self.battery_level = state["battery"]
+        if "charge_state" in state: self.charging_state = state["charge_state"]
+        if "speed" in state or "battery" in state:
+            self.trip_computer.add(state.get("speed"), state.get("battery"), time.monotonic())
+        # values equal to the newest queued or shown value are dropped here, before they take queue slots
+        queued, was_empty = self.command_queue.put_state(state, self.shown_state)
+        if self.recorder is not None:
+            for field in queued: self.recorder.record(field, state[field])
+        if was_empty:
+            self.command_sig.emit()
+
+    def shown_state(self):
+        # plain attribute reads of the design, safe from producer threads
+        return self.dash_board.dash_board_design_widget.current_state() if hasattr(self, "dash_board") else {}
+
+    def toggle_state(self, field):
+        # queued as the absolute state it gives, so a full queue never loses or merges a toggle
+        val, was_empty = self.command_queue.put_toggle(field, self.shown_state)
+        if self.recorder is not None: self.recorder.record(field, val)
+        if was_empty:
+            self.command_sig.emit()
+
+    def put_command(self, field, val):
+        # safe from any thread, only the first command queued until next delivery wakes up GUI thread
+        if self.command_queue.put(field, val):
+            self.command_sig.emit()
+
+    def deliver_commands(self):
+        # delivering at most once per frame, commands keep queuing until then
+        wait = _FRAME_INTERVAL - self.command_delivery_clock.elapsed()
+        if self.command_delivery_clock.isValid() and wait > 0:
+            QTimer.singleShot(wait, self.deliver_commands)
+            return
+        self.command_delivery_clock.start()
+        commands = self.command_queue.take_all()
+        if not commands:
+            return
+        design = self.dash_board.dash_board_design_widget
+        # keys of held controls are kept by GUI thread only, key action timer repeats them
+        keys = {"accelerator_state": Qt.Key.Key_W, "break_state": Qt.Key.Key_Space, "horn_state": Qt.Key.Key_H}
+        state = {}
+        applied = False
+        for field, val, _ in commands:
+            if field in keys: self.keys_[keys[field]] = bool(val)
+            if field in self.command_appliers:
+                # other commands keep their order with state fields before them
+                applied = self.apply_changed_state(design, state) or applied
+                state = {}
+                self.command_appliers[field](val)
+                applied = True
+            else:
+                state[field] = val
+        applied = self.apply_changed_state(design, state) or applied
+        self.command_queue.applied()
+        if self.measure_latency and applied:
+            design.input_applied(commands[0][2])
+
+    def apply_changed_state(self, design, state):
+        # values equal to what dashboard already shows are dropped, all others are drawn in one paint
+        shown_state = design.current_state()
+        state = {field: val for field, val in state.items() if shown_state.get(field) != val}
+        design.apply_state(state)
+        return bool(state)
 
 
 class DashBoard(QWidget):
-    """This is a pyqt widget class to embed this dashboard to other pyqt widgets"""
+    """This is a pyqt widget class to embed this dashboard to other pyqt widgets \n note: \
+    use trigger_action() to control this dashboard, many dashboards can be shown in one window"""
     def __init__(self, parent=None):
         super(DashBoard, self).__init__(parent)
         
         self.vlayout = QVBoxLayout()
         self.setLayout(self.vlayout)
+        self.waiting_controls = []  # controls created before show_dashboard()
+        self.__trigger_action = None
+
+    def trigger_action(self):
+        """Returns the TriggerAction controlling this dashboard, it can be taken before or \
+        after show_dashboard()"""
+        if self.__trigger_action is None:
+            self.__trigger_action = TriggerAction(self)
+        return self.__trigger_action
 
     def show_dashboard(self, hide_creator_button: bool = False, skip_start_screen: bool = False, 
-                        skip_loading_screen: bool = False):
+                        skip_loading_screen: bool = False, skip_start_up_animation: bool = False):
         """This method is to show the dashboard in your window"""
         global _dash_board
         
-        self.dash_board_widget = _DashBoardMain(self, (self.width(), self.height()), hide_creator_button, skip_start_screen, skip_loading_screen, True)
+        self.dash_board_widget = _DashBoardMain(self, (self.width(), self.height()), hide_creator_button, skip_start_screen,
+                                                skip_loading_screen, True, skip_start_up_animation)
         self.dash_board_widget.move(0, 0)
         self.vlayout.addWidget(self.dash_board_widget)
         
-        _dash_board = self.dash_board_widget
+        _dash_board = self.dash_board_widget  # for TriggerAction() created without dashboard
+        for controls in self.waiting_controls:
+            controls.attach(self.dash_board_widget)
+        self.waiting_controls.clear()
+
+
+class DashBoardRenderer():
+    """This class render the dashboard into images without showing any window (e.g.) for status \
+    thumbnails on a server \n note: if no QApplication is created yet, one is created using the \
+    offscreen platform, so no display is needed"""
+    default_state = {"speedometer_range": 200, "speed": 0, "battery": 100, "accelerator_state": 0, "break_state": 0,
+                    "horn_state": 0, "charge_state": 0, "left_indicator_state": 0, "right_indicator_state": 0}
+
+    def __init__(self):
+        if QApplication.instance() is None:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            self.__app = QApplication(sys.argv[:1])
+        self.__dashboards = {}  # size -> dashboard, reused with its cached layers
+
+    def __dashboard(self, width, height):
+        dashboard = self.__dashboards.get((width, height))
+        if dashboard is None:
+            dashboard = _DashBoardContolsDesign(size=QSize(width, height))
+            dashboard.set_speedometer_resetter_state(False)
+            dashboard.skip_start_up_animation()
+            self.__dashboards[(width, height)] = dashboard
+        return dashboard
+
+    def render_image(self, state: dict = {}, width: int = 1280, height: int = 720) -> QImage:
+        """Render given state into a QImage, state keys are same as TriggerAction.update_state() \
+        arguments and speedometer_range, missing keys take default_state values"""
+        state = {**self.default_state, **state}
+        dashboard = self.__dashboard(width, height)
+        dashboard.set_speedometer_range(state.pop("speedometer_range"))
+        dashboard.apply_state(state)
+
+        # no blinking and no speed motion in a still image
+        dashboard.stop_indicator_blink()
+        dashboard.speed_motion_timer.stop()
+
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        dashboard.render(image)
+        return image
+
+    def render_png(self, file_name: str, state: dict = {}, width: int = 1280, height: int = 720) -> bool:
+        """Render given state into a png file, returns False if file could not be saved"""
+        return self.render_image(state, width, height).save(file_name, "PNG")
+
+    def render_rgba(self, state: dict = {}, width: int = 1280, height: int = 720) -> bytes:
+        """Render given state into raw RGBA bytes, 4 bytes per pixel row by row"""
+        image = self.render_image(state, width, height).convertToFormat(QImage.Format.Format_RGBA8888)
+        return image.constBits().asstring(image.sizeInBytes())
 
 
 class TriggerAction():
     """This class contain all functionality settings of dashboard \
-        including lunch_dashboard() method to show dashboard as seperate window"""
-    def __init__(self):
-        self.__dbc = _DashBoardControls()
+        including lunch_dashboard() method to show dashboard as seperate window \n note: pass \
+        a DashBoard widget (or use DashBoard.trigger_action()) to control that dashboard, without \
+        it the last shown DashBoard widget is controlled. Methods can be called from any number of \
+        threads, calls go through a bounded queue which the dashboard takes once per frame"""
+    def __init__(self, dashboard: "DashBoard" = None):
+        self.__dbc = _DashBoardControls(dash_board=dashboard)
 
     def launch_dashboard(self):
         """Open dashboard window"""
@@ -1165,6 +2384,19 @@ class TriggerAction():
             be called before you call launch_dashboard() method to take effect"""
         self.__dbc.skip_loading_screen(skip)
 
+    def skip_start_up_animation(self, skip: bool):
+        """Skip dashboard popup animation and directly show the final dashboard \n note: call this method \
+            before launch_dashboard() method to never play it, calling it while the animation is playing \
+            jumps to its end"""
+        self.__dbc.skip_start_up_animation(skip)
+
+    def set_start_up_animation_speed(self, factor: float = 1.0):
+        """Play dashboard popup animation factor times faster (e.g.) 2 for double speed and 0.5 for \
+        half speed \n note: it can be changed while the animation is playing"""
+        if factor <= 0:
+            raise ValueError("factor should be greater than 0")
+        self.__dbc.set_start_up_animation_speed(factor)
+
     def set_speedometer_range(self, top_speed: int):
         """Set speedometer range (i.e.) 0 to top speed \n
         Note: given value should be between 40 to 400 and the given value \
@@ -1192,6 +2424,12 @@ class TriggerAction():
         you did not have speedometer to update the current speed else set state False when you have speedometer to update current speed"""
         self.__dbc.set_speedometer_resetter_state(state)
 
+    def set_speedometer_rates(self, accelerate_rate: float = 90, decelerate_rate: float = 90, break_rate: float = 270):
+        """Set how fast speed rises while accelerator is applied and falls after accelerator release \
+        or while break is applied, in km/h per second \n note: falling rates take effect only when \
+        speedometer resetter state is True"""
+        self.__dbc.set_speedometer_rates(accelerate_rate, decelerate_rate, break_rate)
+
     def apply_break(self):
         """To activate break"""
         self.__dbc.apply_break()
@@ -1218,6 +2456,11 @@ class TriggerAction():
             again to invert current state of right indicator"""
         self.__dbc.right_indicator_on_or_off()
 
+    def set_hazard_lights(self, on: bool):
+        """Turn both indicators on or off together as hazard lights \n note: both sides change in \
+            the same frame and blink in the same phase, as every indicator of the process does"""
+        self.__dbc.set_hazard_lights(on)
+
     def update_battery_power(self, current_battery_power: int):
         """To set current battery power level in percentage\n note: Value should be between 0 to 100"""
         self.__dbc.update_battery_power(current_battery_power)
@@ -1230,6 +2473,105 @@ class TriggerAction():
         """To indicate charging is off"""
         self.__dbc.charging_off()
 
+    def update_state(self, speed: int = None, battery: int = None, accelerator_state: bool = None, break_state: bool = None,
+                    horn_state: bool = None, charge_state: bool = None, left_indicator_state: bool = None,
+                    right_indicator_state: bool = None):
+        """To update several states at once, fields left as None are not changed \n note: all changed fields \
+        reach the dashboard in the same frame and are drawn in one paint, values equal to the newest queued value \
+        or to what dashboard already shows are dropped in the calling thread. Unlike left_indicator_on_or_off(), indicator states here are absolute values"""
+        state = {"speed": speed, "battery": battery, "accelerator_state": accelerator_state, "break_state": break_state,
+                "horn_state": horn_state, "charge_state": charge_state, "left_indicator_state": left_indicator_state,
+                "right_indicator_state": right_indicator_state}
+        self.__dbc.update_state({field: val for field, val in state.items() if val is not None})
+
+    def apply_snapshot(self, snapshot: dict):
+        """Same as update_state() with a dict of state fields (e.g.) {"speed": 80, "battery": 60}"""
+        self.update_state(**snapshot)
+
+    def show_performance_overlay(self, show: bool):
+        """To show or hide performance overlay with paints per second, average and worst paint \
+        time, latency from a state change call to the end of the paint showing it and count of \
+        state changes waiting in queue \n note: timings are collected only while it is shown"""
+        self.__dbc.show_performance_overlay(show)
+
+    def set_render_quality(self, quality: str = "full", frame_budget_ms: float = 16.7):
+        """Set render quality tier as "full", "balanced" (lighter antialiasing, plain fills for \
+        patterns) or "low" (no antialiasing, plain colors for gradients and patterns), or "auto" to \
+        step between them by measured paint time \n note: in "auto" quality drops a tier when average \
+        paint time is over frame_budget_ms and goes back up when it is under half of it"""
+        if quality != "auto" and quality not in _QUALITY_TIERS:
+            raise ValueError("quality should be one of 'auto', 'full', 'balanced' and 'low'")
+        self.__dbc.set_render_quality(quality, frame_budget_ms)
+
+    def use_needle_sprites(self, enable: bool, memory_limit_mb: float = 16):
+        """To draw speed and battery hands from pre rendered pixmaps, one per whole degree, \
+        built when first needed \n note: least recently used pixmaps are dropped to stay under \
+        memory_limit_mb. With sprites the speed hand moves in whole degree steps"""
+        self.__dbc.use_needle_sprites(enable, memory_limit_mb)
+
+    def set_needle_smoothing(self, smooth_time: float = 0.15):
+        """To move speed and battery needles smoothly to each new value in about smooth_time seconds, \
+        without overshoot (critically damped), pass 0 to jump at once \n note: useful when speed comes \
+        at a low rate (e.g.) 10 Hz, needles move every frame while converging and stop when settled"""
+        if smooth_time < 0:
+            raise ValueError("smooth_time should not be negative")
+        self.__dbc.set_needle_smoothing(smooth_time)
+
+    def set_recorder(self, recorder):
+        """To record every state change given to this TriggerAction, pass None to stop \
+        recording \n note: use Recorder class in recorder.py to record into a replayable log file"""
+        self.__dbc.set_recorder(recorder)
+
+    def set_history(self, history):
+        """To keep a history of shown speed, battery and break state, each change is appended to \
+        history, pass None to stop \n note: use TelemetryHistory class in history.py for a bounded \
+        history with a trend graph"""
+        self.__dbc.set_history(history)
+
+    def show_trip_computer(self, show: bool):
+        """To show or hide trip computer readout (distance, average speed, consumption and range) \
+        left of speedometer \n note: trip values are kept from speeds and battery levels given to \
+        this TriggerAction whether the readout is shown or not"""
+        self.__dbc.show_trip_computer(show)
+
+    def set_battery_capacity(self, capacity_kwh: float = 40):
+        """Battery capacity in kWh, used to give consumption in Wh per km"""
+        if capacity_kwh <= 0:
+            raise ValueError("capacity_kwh should be greater than 0")
+        self.__dbc.set_battery_capacity(capacity_kwh)
+
+    def trip_values(self) -> dict:
+        """Trip values since start or reset_trip(): distance_km, trip_time_s, average_speed (km/h), \
+        recent_speed (km/h weighted over last minute), consumption_wh_per_km (weighted over last 10 \
+        km) and range_km (battery left at that consumption), None until battery level dropped once \
+        while driving \n note: speed is held at the last given value until the next one"""
+        return self.__dbc.trip_values()
+
+    def reset_trip(self):
+        """To start a new trip from 0 km"""
+        self.__dbc.reset_trip()
+
+    def set_command_queue(self, capacity: int = 256, policy: str = "coalesce"):
+        """Set size of the queue carrying calls to the dashboard and what a full queue does with a \
+        new call, "drop_oldest" drops the oldest queued speed or battery value a newer one replaces, \
+        "coalesce" replaces the queued speed or battery value of the same field (else drops as \
+        "drop_oldest") and "block" waits until the dashboard takes the queue \n note: other calls \
+        and the newest value of each field are never dropped, with nothing to drop the queue grows \
+        over capacity. Calls from the GUI thread never block, they drop or grow instead"""
+        if policy not in _QUEUE_POLICIES:
+            raise ValueError("policy should be one of 'drop_oldest', 'coalesce' and 'block'")
+        if capacity < 1:
+            raise ValueError("capacity should be at least 1")
+        self.__dbc.set_command_queue(capacity, policy)
+
+    def command_queue_counters(self) -> dict:
+        """Queued, enqueued, coalesced, unchanged (not queued as equal to the newest queued or shown \
+        value), dropped (also per field in dropped_fields), overflowed (queued over capacity), \
+        blocked and drained call counts, and average and \
+        worst time spent in a call (enqueue_avg_us, enqueue_worst_us) and waiting in queue \
+        (queue_delay_avg_ms, queue_delay_worst_ms)"""
+        return self.__dbc.command_queue_counters()
+
 
 # main
 if __name__ == "__main__":
@@ -0,0 +1,375 @@
+"""This module provide FleetWall, a widget showing hundreds of miniature dashboards (speed, \
+battery, indicators, break and charging) in a grid, for operations centre screens \n
+    The state of all vehicles is given as one columnar array, a numpy structured array of \
+    FLEET_DTYPE (or a dict of numpy columns speed, battery and flags), one row per vehicle. \
+    Rows are compared with the shown rows in one vectorised diff per frame and only the tiles \
+    of changed rows are painted again. The flags column use the bits of telemetry.py. \n
+Example: \n
+    states = fleet_states(500)
+    wall = FleetWall(500, labels=[f"EV {i}" for i in range(500)])
+    wall.show()
+    ...
+    states["speed"][12] = 80
+    states["flags"][12] |= LEFT_INDICATOR_FLAG
+    wall.set_states(states)  # from any thread, at any rate
+note: this module needs numpy
+"""
+
+import math
+import threading
+
+import numpy as np
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+
+from dashboard import _BlinkClock, _DashBoardContolsDesign, _FRAME_INTERVAL
+from telemetry import BREAK_FLAG, LEFT_INDICATOR_FLAG, RIGHT_INDICATOR_FLAG, CHARGING_FLAG
+
+# state of a vehicle as given to FleetWall.set_states()
+FLEET_DTYPE = np.dtype([("speed", "<f4"), ("battery", "u1"), ("flags", "u1")])
+# state of a vehicle as drawn on its tile, so changes too small to be seen are not painted
+_TILE_DTYPE = np.dtype([("speed", "<i2"), ("battery", "u1"), ("flags", "u1")])
+_SHOWN_FLAGS = BREAK_FLAG | LEFT_INDICATOR_FLAG | RIGHT_INDICATOR_FLAG | CHARGING_FLAG
+_INDICATOR_FLAGS = LEFT_INDICATOR_FLAG | RIGHT_INDICATOR_FLAG
+
+_TILE_BACKGROUND = QColor(18, 4, 4)
+_TILE_PARTS = ("dial", "speed", "battery", "charge", "indicators", "label")  # fragments of a tile
+_TILE_BORDER_COLORS = (QColor(90, 60, 100), QColorConstants.Svg.red)  # break off, on
+_INDICATOR_COLORS = (QColorConstants.DarkGreen, QColorConstants.Green)  # blink off, on
+# battery bar color from this percentage up, same colors as battery dial
+_BATTERY_COLORS = ((40, QColor(66, 245, 66, 190)), (20, QColor(224, 210, 13, 210)), (0, QColorConstants.Svg.red))
+
+
+def fleet_states(vehicle_count: int) -> np.ndarray:
+    """Returns a zeroed state array of vehicle_count rows for FleetWall.set_states()"""
+    return np.zeros(vehicle_count, FLEET_DTYPE)
+
+
+def _preset_color(preset) -> QColor:
+    # middle color of a gradient preset, text of tiles is drawn with plain colors
+    stops = QGradient(preset).stops()
+    return QColor(stops[len(stops)//2][1])
+
+
+class FleetWall(QWidget):
+    """Grid of miniature dashboards, one tile per vehicle \n note: the speed dial and hand are \
+    drawn by the dashboard drawing code once per hand angle into one sprite atlas with every \
+    other tile part, all tiles of a frame are then painted with one drawPixmapFragments() call. \
+    Give top_speed from 40 to 400 as in TriggerAction.set_speedometer_range()"""
+    state_sig = pyqtSignal()
+
+    def __init__(self, vehicle_count: int, tile_width: int = 120, top_speed: int = 200, labels: list = None, parent=None):
+        super().__init__(parent)
+        if labels is not None and len(labels) < vehicle_count:
+            raise ValueError(f"labels should have a label for each of {vehicle_count} vehicles, got {len(labels)}")
+        self.vehicle_count = vehicle_count
+        self.tile_width = tile_width
+        self.labels = list(labels) if labels is not None else [str(index) for index in range(vehicle_count)]
+
+        self.shown = np.zeros(vehicle_count, _TILE_DTYPE)
+        self.pending_states = None  # newest rows waiting for next frame
+        self.pending_states_lock = threading.Lock()
+        self.state_delivery_clock = QElapsedTimer()
+        self.applied = 0  # set_states() calls reaching the GUI thread
+        self.changed_tiles = 0
+        self.painted_tiles = 0
+
+        self.top_speed = top_speed
+        self.tile_sprites()
+        self.tile_layout()
+
+        # blinking in the same phase as every dashboard of the process, subscribed only while
+        # shown with some indicator on. The clock stops after a deleted wall is disconnected
+        blink_clock = _BlinkClock.shared()
+        self.blink = blink_clock.phase
+        self.blink_subscribed = False
+        self.destroyed.connect(blink_clock.stop_unused, Qt.ConnectionType.QueuedConnection)
+
+        self.state_sig.connect(self.deliver_pending_states)
+
+    def set_states(self, states):
+        """Give the state of all vehicles, a FLEET_DTYPE array (or dict of speed, battery and \
+        flags columns) of vehicle_count rows \n note: can be called from any thread at any rate, \
+        the given array is copied and only the newest one is drawn in each frame"""
+        rows = np.empty(self.vehicle_count, _TILE_DTYPE)
+        rows["speed"] = np.clip(np.rint(states["speed"]), 0, self.stamp.speed_range)
+        rows["battery"] = np.clip(states["battery"], 0, 100)
+        rows["flags"] = np.bitwise_and(states["flags"], _SHOWN_FLAGS)
+        with self.pending_states_lock:
+            first_pending = self.pending_states is None
+            self.pending_states = rows
+        if first_pending:  # one delivery per frame carries every later rows too
+            self.state_sig.emit()
+
+    def deliver_pending_states(self):
+        # at most once per frame, later rows replace waiting rows meanwhile
+        if self.state_delivery_clock.isValid() and self.state_delivery_clock.elapsed() < _FRAME_INTERVAL:
+            QTimer.singleShot(_FRAME_INTERVAL - self.state_delivery_clock.elapsed(), self.deliver_pending_states)
+            return
+        self.state_delivery_clock.start()
+        with self.pending_states_lock:
+            rows, self.pending_states = self.pending_states, None
+        if rows is None:
+            return
+        self.applied += 1
+        changed = np.flatnonzero(rows != self.shown)
+        self.shown = rows
+        self.update_blink_subscription()
+        self.update_tiles(changed)
+
+    def update_tiles(self, indexes: np.ndarray):
+        self.changed_tiles += len(indexes)
+        if len(indexes) > self.vehicle_count//2:  # one rect is cheaper than many
+            self.update()
+            return
+        tile_width, tile_height = self.tile_size.width(), self.tile_size.height()
+        for index in indexes.tolist():
+            row, column = divmod(index, self.columns)
+            self.update(column*tile_width, row*tile_height, tile_width, tile_height)
+
+    def update_blink_subscription(self):
+        blink_clock = _BlinkClock.shared()
+        blinking = self.isVisible() and bool((self.shown["flags"] & _INDICATOR_FLAGS).any())
+        if blinking and not self.blink_subscribed:
+            blink_clock.subscribe(self.indicator_blink_animation)
+            self.blink = blink_clock.phase  # joining the running phase
+        elif not blinking and self.blink_subscribed:
+            blink_clock.unsubscribe(self.indicator_blink_animation)
+        self.blink_subscribed = blinking
+
+    @pyqtSlot(int)
+    def indicator_blink_animation(self, phase):
+        self.blink = phase
+        self.update_tiles(np.flatnonzero(self.shown["flags"] & _INDICATOR_FLAGS))
+
+    def counters(self) -> dict:
+        """Applied state arrays, changed tiles and painted tiles counts"""
+        return {"applied": self.applied, "changed_tiles": self.changed_tiles, "painted_tiles": self.painted_tiles}
+
+    def tile_layout(self):
+        # columns from widget width, each tile keeps its fragments and only their sources change
+        self.columns = max(1, min(self.vehicle_count, self.width()//self.tile_width))
+        tile_width, tile_height = self.tile_size.width(), self.tile_size.height()
+        full_rows, last_columns = divmod(self.vehicle_count, self.columns)
+        self.tiles_region = QRegion(0, 0, self.columns*tile_width, full_rows*tile_height) + \
+                            QRegion(0, full_rows*tile_height, last_columns*tile_width, tile_height)
+        # borders of every tile as long one pixel rects, break borders are drawn over them per tile
+        self.border_strips = []
+        for column in range(self.columns):
+            height = (full_rows + (column < last_columns))*tile_height
+            self.border_strips += [QRect(x, 0, 1, height) for x in (column*tile_width, (column+1)*tile_width - 1)]
+        for row in range(full_rows + bool(last_columns)):
+            width = (self.columns if row < full_rows else last_columns)*tile_width
+            self.border_strips += [QRect(0, y, width, 1) for y in (row*tile_height, (row+1)*tile_height - 1)]
+        self.border_rects = []
+        self.tile_fragments = []
+        for index in range(self.vehicle_count):
+            row, column = divmod(index, self.columns)
+            tile = QPoint(column*tile_width, row*tile_height)
+            self.border_rects.append(QRect(tile.x(), tile.y(), tile_width-1, tile_height-1))
+            self.tile_fragments.append([self.fragment(tile, part, self.sources[part][0]) for part in _TILE_PARTS[:-1]]
+                                       + [self.fragment(tile, "label", self.sources["label"][index])])
+        self.update()
+
+    def tile_sprites(self):
+        # every part of a tile is pre rendered into one atlas, so a frame is painted with one call
+        self.tile_size = QSize(self.tile_width, round(self.tile_width*0.75))
+        tile_width, tile_height = self.tile_size.width(), self.tile_size.height()
+        margin = max(round(tile_height*0.04), 1)
+        dial_side = tile_height - 2*margin
+
+        # stamp sized so that its speedometer is as big as tile dial
+        stamp_width = round(dial_side/0.4)
+        self.stamp = _DashBoardContolsDesign(size=QSize(stamp_width, round(stamp_width*9/16)))
+        self.stamp.set_speedometer_resetter_state(False)
+        self.stamp.skip_start_up_animation()
+        self.stamp.time_update_timer.stop()
+        self.stamp.set_speedometer_range(self.top_speed)
+        self.stamp_offset = QPoint(margin, margin) - self.stamp.speedometer_bounding_rect.topLeft().toPoint()
+        self.hand_center, self.hand_polygon, self.hand_pen, self.hand_brush = self.stamp.speed_hand()
+
+        panel_x = margin*2 + dial_side
+        panel_width = tile_width - panel_x - margin
+        self.speed_point = QPoint(panel_x, margin)
+        self.battery_rect = QRect(panel_x, round(tile_height*0.42), panel_width, max(round(tile_height*0.1), 2))
+        indicator_size = max(round(tile_height*0.12), 4)
+        self.indicators_rect = QRect(panel_x, round(tile_height*0.62), panel_width, indicator_size*2)
+        self.dial_rect = QRect(1, 1, panel_x - 1, tile_height - 2)  # inside tile border
+        # part -> top left in tile
+        self.part_points = {"dial": self.dial_rect.topLeft(), "speed": self.speed_point,
+                            "battery": self.battery_rect.topLeft(), "charge": QPoint(panel_x, self.battery_rect.bottom() + margin),
+                            "indicators": self.indicators_rect.topLeft(), "label": QPoint(panel_x, round(tile_height*0.78))}
+
+        self.speed_font = QFont("Consolas", 0, 0, True)
+        self.speed_font.setPixelSize(max(round(tile_height*0.26), 6))
+        self.small_font = QFont("Consolas", 0, 0, True)
+        self.small_font.setPixelSize(max(round(tile_height*0.14), 6))
+        speed_color = _preset_color(QGradient.Preset.Crystalline)
+        # speeds of one hand angle share a dial sprite
+        angles = [120+round(speed/self.stamp.speed_angle_factor) for speed in range(self.stamp.speed_range + 1)]
+        dial_angles = sorted(set(angles))
+        # part -> sprites, in order of _TILE_PARTS
+        sprites = {
+            "dial": [self.dial_painting(angle) for angle in dial_angles],
+            "speed": [self.text_sprite(str(speed), self.speed_font, speed_color) for speed in range(self.stamp.speed_range + 1)],
+            "battery": [self.battery_sprite(battery) for battery in range(101)],
+            "charge": [self.text_sprite("CHG", self.small_font, _preset_color(QGradient.Preset.HeavyRain))],
+            # (left lit, right lit) as 2*left + right
+            "indicators": [self.indicators_sprite(left, right, indicator_size) for left in (0, 1) for right in (0, 1)],
+            "label": [self.text_sprite(label, self.small_font, QColor(200, 200, 200)) for label in self.labels],
+        }
+        self.atlas_packing(sprites)
+        angle_sources = dict(zip(dial_angles, self.sources["dial"]))
+        self.dial_sources = [angle_sources[angle] for angle in angles]
+
+    def atlas_packing(self, sprites: dict):
+        # sprites of a part get equal slots (in device pixels), placed in rows of the atlas
+        self.slot_sizes = {part: QSize(max(pixmap.width() for pixmap in pixmaps), max(pixmap.height() for pixmap in pixmaps))
+                           for part, pixmaps in sprites.items()}
+        atlas_width = max(2048, *(size.width() for size in self.slot_sizes.values()))
+        self.sources = {}  # part -> (left, top) of each sprite in atlas
+        x = y = row_height = 0
+        for part, pixmaps in sprites.items():
+            slot = self.slot_sizes[part]
+            self.sources[part] = []
+            for _ in pixmaps:
+                if x + slot.width() > atlas_width:
+                    x, y, row_height = 0, y + row_height, 0
+                self.sources[part].append((x, y))
+                x += slot.width()
+                row_height = max(row_height, slot.height())
+        self.atlas = QPixmap(atlas_width, y + row_height)
+        self.atlas.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self.atlas)
+        for part, pixmaps in sprites.items():
+            for (left, top), pixmap in zip(self.sources[part], pixmaps):
+                painter.drawPixmap(QRect(left, top, pixmap.width(), pixmap.height()), pixmap)  # pixel to pixel
+        painter.end()
+
+    def fragment(self, tile: QPoint, part: str, source: tuple) -> QPainter.PixmapFragment:
+        # slot of a part at its place in a tile, scaled from device pixels
+        scale = 1/self.devicePixelRatioF()
+        slot = self.slot_sizes[part]
+        center = QPointF(tile + self.part_points[part]) + QPointF(slot.width(), slot.height())*scale/2
+        return QPainter.PixmapFragment.create(center, QRectF(source[0], source[1], slot.width(), slot.height()), scale, scale)
+
+    def sprite(self, size: QSize) -> tuple:
+        # transparent pixmap and a painter on it
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap((QSizeF(size)*dpr).toSize())
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHints(self.stamp.render_hints, True)
+        return pixmap, painter
+
+    def text_sprite(self, text: str, font: QFont, color: QColor) -> QPixmap:
+        # clipped at tile border, so text never spills into a neighbour tile
+        font_metrics = QFontMetrics(font)
+        max_width = self.tile_size.width() - self.speed_point.x() - 1
+        pixmap, painter = self.sprite(QSize(min(font_metrics.boundingRect(text).right() + 2, max_width), font_metrics.height()))
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(0, font_metrics.ascent(), text)
+        painter.end()
+        return pixmap
+
+    def indicators_sprite(self, left_lit: int, right_lit: int, indicator_size: int) -> QPixmap:
+        width, middle = self.indicators_rect.width(), self.indicators_rect.height()//2
+        pixmap, painter = self.sprite(self.indicators_rect.size())
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(_INDICATOR_COLORS[left_lit])
+        painter.drawPolygon(QPolygon([QPoint(0, middle), QPoint(indicator_size, 0), QPoint(indicator_size, middle*2)]))
+        painter.setBrush(_INDICATOR_COLORS[right_lit])
+        painter.drawPolygon(QPolygon([QPoint(width, middle), QPoint(width - indicator_size, 0), QPoint(width - indicator_size, middle*2)]))
+        painter.end()
+        return pixmap
+
+    def battery_sprite(self, battery: int) -> QPixmap:
+        pixmap, painter = self.sprite(self.battery_rect.size())
+        painter.fillRect(QRect(QPoint(0, 0), self.battery_rect.size()), QColor(67, 13, 13, 200))
+        for level, color in _BATTERY_COLORS:
+            if battery >= level:
+                painter.fillRect(0, 0, round(self.battery_rect.width()*battery/100), self.battery_rect.height(), color)
+                break
+        painter.end()
+        return pixmap
+
+    def dial_painting(self, angle: int) -> QPixmap:
+        # dial from the dashboard speedometer layer with the hand at angle and center point over it
+        pixmap, painter = self.sprite(self.dial_rect.size())
+        painter.translate(-self.dial_rect.topLeft())
+        painter.fillRect(self.dial_rect, _TILE_BACKGROUND)
+        painter.save()
+        painter.translate(self.stamp_offset)
+        self.stamp.static_layer_painting(painter, "speedometer", self.stamp.speedometer_rect(), self.stamp.speedometer_dial_painting)
+        self.stamp.needle_painting(painter, "speed", self.hand_center, angle, self.hand_polygon, self.hand_pen, self.hand_brush)
+        painter.restore()
+        painter.setPen(self.stamp.preset_pen(QGradient.Preset.CrystalRiver, round(self.stamp.width()*0.03), cap=Qt.PenCapStyle.RoundCap))
+        painter.drawPoint(self.stamp.speedometer_bounding_rect.center() + QPointF(self.stamp_offset))
+        painter.end()
+        return pixmap
+
+    def tiles_in(self, region: QRegion) -> list:
+        # indexes of tiles touching region
+        tile_width, tile_height = self.tile_size.width(), self.tile_size.height()
+        indexes = set()
+        for rect in region.rects():
+            first_column, last_column = max(rect.left()//tile_width, 0), min(rect.right()//tile_width, self.columns-1)
+            for row in range(max(rect.top()//tile_height, 0), rect.bottom()//tile_height + 1):
+                first_index = row*self.columns
+                if first_index >= self.vehicle_count:
+                    break
+                indexes.update(range(first_index + first_column, min(first_index + last_column + 1, self.vehicle_count)))
+        return sorted(indexes)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # plain fills, cheaper than blitting the background of each tile
+        for rect in (event.region() & self.tiles_region).rects():
+            painter.fillRect(rect, _TILE_BACKGROUND)
+        for rect in (event.region() - self.tiles_region).rects():
+            painter.fillRect(rect, QColorConstants.Black)
+        indexes = self.tiles_in(event.region())
+        rows = self.shown[indexes].tolist()  # python ints, faster than numpy scalars per field
+        speed_sources, battery_sources, indicator_sources = self.sources["speed"], self.sources["battery"], self.sources["indicators"]
+        break_rects = []
+        fragments = []
+        for index, (speed, battery, flags) in zip(indexes, rows):
+            dial, speed_text, battery_bar, charge, indicators, label = self.tile_fragments[index]
+            if flags & BREAK_FLAG:
+                break_rects.append(self.border_rects[index])
+            dial.sourceLeft, dial.sourceTop = self.dial_sources[speed]
+            speed_text.sourceLeft, speed_text.sourceTop = speed_sources[speed]
+            battery_bar.sourceLeft, battery_bar.sourceTop = battery_sources[battery]
+            fragments += (dial, speed_text, battery_bar, label)
+            if flags & CHARGING_FLAG:
+                fragments.append(charge)
+            if flags & _INDICATOR_FLAGS:
+                lit = 2*bool(self.blink and flags & LEFT_INDICATOR_FLAG) + bool(self.blink and flags & RIGHT_INDICATOR_FLAG)
+                indicators.sourceLeft, indicators.sourceTop = indicator_sources[lit]
+                fragments.append(indicators)
+        for rect in self.border_strips:  # fills, cheaper than stroking lines
+            painter.fillRect(rect, _TILE_BORDER_COLORS[0])
+        painter.setPen(QPen(_TILE_BORDER_COLORS[1], 0))  # cosmetic pen
+        painter.drawRects(break_rects)
+        painter.drawPixmapFragments(fragments, self.atlas)
+        self.painted_tiles += len(indexes)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_blink_subscription()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_blink_subscription()
+
+    def resizeEvent(self, event):
+        if max(1, min(self.vehicle_count, self.width()//self.tile_width)) != self.columns:
+            self.tile_layout()
+        super().resizeEvent(event)
+
+    def sizeHint(self) -> QSize:
+        columns = min(self.vehicle_count, max(1, round(math.sqrt(self.vehicle_count*16/9*0.75))))
+        return QSize(columns*self.tile_width, math.ceil(self.vehicle_count/columns)*round(self.tile_width*0.75))
@@ -0,0 +1,180 @@
+"""This module provide a bounded history of dashboard telemetry and a trend strip widget drawing it \n
+    1) TelemetryHistory keep timestamped speed, battery and break samples in a fixed capacity \
+       ring buffer (one numpy structured array of HISTORY_DTYPE), the oldest samples are \
+       overwritten, so memory stays the same for any uptime and sample rate. segments() give the \
+       samples as numpy views without copying. \n
+    2) TrendStrip draw the last minutes of a history, decimated with largest triangle three \
+       buckets (lttb) to at most one point per pixel column. \n
+Example: \n
+    history = TelemetryHistory(capacity=100*3600)  # one hour at 100 Hz, 14 bytes per sample
+    trigger_action.set_history(history)  # samples of what the dashboard shows
+    strip = TrendStrip(history, minutes=5)
+    strip.show()
+    ...
+    for samples in history.segments():  # oldest first
+        analyse(samples["time"], samples["speed"])
+note: this module needs numpy
+"""
+
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+
+# time in seconds of time.monotonic(), speed in km/h, battery in percentage, break state 0 or 1
+HISTORY_DTYPE = np.dtype([("time", "<f8"), ("speed", "<f4"), ("battery", "u1"), ("break_state", "u1")])
+
+
+class TelemetryHistory():
+    """Fixed capacity ring buffer of telemetry samples \n note: append() and reading are safe from \
+    any thread, views given by segments() are overwritten once the buffer wraps around to them"""
+    def __init__(self, capacity: int = 360000):
+        if capacity < 1:
+            raise ValueError("capacity should be at least 1")
+        self.samples = np.zeros(capacity, HISTORY_DTYPE)
+        self.capacity = capacity
+        self.count = 0  # samples appended since creation, next one goes to count % capacity
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    def append(self, speed: float, battery: int, break_state: bool, timestamp: float = None):
+        """Add a sample, timestamp defaults to now in time.monotonic() seconds"""
+        with self.__lock:
+            self.samples[self.count % self.capacity] = (time.monotonic() if timestamp is None else timestamp, speed, battery, break_state)
+            self.count += 1
+
+    def segments(self) -> tuple:
+        """Samples from oldest to newest as one or two numpy views of the buffer, without copying"""
+        with self.__lock:
+            return self.__segments()
+
+    def array(self, since: float = None) -> np.ndarray:
+        """Copy of the samples from oldest to newest, only those at or after since (monotonic seconds) when given"""
+        with self.__lock:
+            segments = self.__segments()
+            if since is not None:
+                segments = [segment[np.searchsorted(segment["time"], since):] for segment in segments]
+            return np.concatenate(segments) if segments else self.samples[:0].copy()
+
+    def __segments(self):
+        if self.count <= self.capacity:
+            return (self.samples[:self.count],)
+        head = self.count % self.capacity
+        return tuple(segment for segment in (self.samples[head:], self.samples[:head]) if len(segment))
+
+    def clear(self):
+        with self.__lock:
+            self.count = 0
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indexes of at most threshold points keeping the shape of x sorted series, chosen by largest \
+    triangle three buckets"""
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    every = (length-2)/(threshold-2)
+    indexes = np.empty(threshold, np.int64)
+    indexes[0] = selected = 0
+    for bucket in range(threshold-2):
+        start, end = int(bucket*every)+1, int((bucket+1)*every)+1
+        next_end = min(int((bucket+2)*every)+1, length)
+        # point of this bucket making the largest triangle with last selected point and average of next bucket
+        average_x, average_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x[selected]-average_x)*(y[start:end]-y[selected]) - (x[selected]-x[start:end])*(average_y-y[selected]))
+        indexes[bucket+1] = selected = start + int(areas.argmax())
+    indexes[-1] = length-1
+    return indexes
+
+
+def min_max(x: np.ndarray, y: np.ndarray, buckets: int, x_range: tuple = None) -> tuple:
+    """Smallest and largest y of each of buckets equal parts of x_range (default first to last x) of \
+    x sorted series, returns (bucket, y min, y max) of buckets having samples"""
+    if not len(x):
+        return np.zeros(0, np.int64), y[:0], y[:0]
+    start, end = (x[0], x[-1]) if x_range is None else x_range
+    bucket_of = np.clip(((x-start)/((end-start) or 1)*buckets).astype(np.int64), 0, buckets-1)
+    starts = np.flatnonzero(np.r_[True, bucket_of[1:] != bucket_of[:-1]])
+    return bucket_of[starts], np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)
+
+
+class TrendStrip(QWidget):
+    """Graph of the last minutes of a TelemetryHistory, speed and battery as lines and break as red \
+    marks \n note: decimation is "lttb" (one point per pixel column) or "minmax" (a vertical line \
+    from smallest to largest value of each pixel column), top_speed is the top of the speed scale"""
+    def __init__(self, history: TelemetryHistory, minutes: float = 5, top_speed: int = 200, decimation: str = "lttb", parent=None):
+        super().__init__(parent)
+        if decimation not in ("lttb", "minmax"):
+            raise ValueError("decimation should be 'lttb' or 'minmax'")
+        self.history = history
+        self.window = minutes*60
+        self.top_speed = top_speed
+        self.decimation = decimation
+        self.setMinimumSize(120, 40)
+        self.resize(600, 120)
+        self.speed_pen = QPen(QColorConstants.Svg.deepskyblue, 1.5)
+        self.battery_pen = QPen(QColorConstants.Svg.lime, 1)
+        self.break_pen = QPen(QColorConstants.Svg.red, 1)
+
+        # a pixel column is a window/width seconds, drawn again about once per column
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.update)
+
+    def column_interval(self):
+        return min(max(round(self.window*1000/max(self.width(), 1)), 100), 1000)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start(self.column_interval())
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.refresh_timer.isActive():
+            self.refresh_timer.start(self.column_interval())
+
+    def series_points(self, x, y, top):
+        # y from 0 to top in widget height, bottom up
+        height = self.height()-1
+        y = height - np.clip(y.astype(np.float64)/top, 0, 1)*height
+        if self.decimation == "lttb":
+            indexes = lttb(x, y, self.width())
+            return [QPolygonF([QPointF(px, py) for px, py in zip(x[indexes].tolist(), y[indexes].tolist())])]
+        columns, low, high = min_max(x, y, self.width(), (0, self.width()))
+        return [QLineF(column, top_y, column, bottom_y) for column, top_y, bottom_y in zip(columns.tolist(), low.tolist(), high.tolist())]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColorConstants.Black)
+        end = time.monotonic()
+        samples = self.history.array(since=end-self.window)
+        if not len(samples):
+            return
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        x = (samples["time"]-(end-self.window))/self.window*(self.width()-1)
+
+        # break marks at bottom, one per pixel column
+        painter.setPen(self.break_pen)
+        for column in np.unique(x[samples["break_state"] != 0].astype(np.int64)).tolist():
+            painter.drawLine(column, self.height()-4, column, self.height())
+
+        for pen, y, top in ((self.battery_pen, samples["battery"], 100), (self.speed_pen, samples["speed"], self.top_speed)):
+            painter.setPen(pen)
+            for shape in self.series_points(x, y, top):
+                if isinstance(shape, QPolygonF):
+                    painter.drawPolyline(shape)
+                else:
+                    painter.drawLine(shape)
@@ -0,0 +1,207 @@
+"""This module provide record and replay of dashboard input \n
+    1) Recorder write every state change given to a TriggerAction into a compact append only \
+       binary log with a monotonic timestamp, and a seek index file beside it (<log file>.idx). \n
+    2) Player feed the log back into a TriggerAction at 0.1x to 100x speed or as fast as \
+       possible, with random seek through the index. The log is read memory mapped, so long \
+       drive logs are not loaded into RAM. \n
+Example: \n
+    recorder = Recorder("drive.evlog")
+    trigger_action.set_recorder(recorder)
+    ...
+    trigger_action.set_recorder(None)
+    recorder.close()
+
+    player = Player("drive.evlog", trigger_action, speed=10)
+    player.seek(120)
+    player.start()
+"""
+
+import bisect
+import mmap
+import struct
+import threading
+import time
+
+_MAGIC = b"EVDBLOG1"
+# timestamp in nanoseconds from start of recording (uint64), field code (uint8), value (int32)
+_ENTRY = struct.Struct("<QBi")
+# timestamp (uint64), log file offset (uint64), state of each _STATE_FIELDS before the entry at offset
+# (speedometer range comes first as speed is drawn relative to it)
+_STATE_FIELDS = ("speedometer_range", "speedometer_resetter_state", "speed", "battery", "accelerator_state",
+                "break_state", "horn_state", "charge_state", "left_indicator_state", "right_indicator_state")
+_INDEX_ENTRY = struct.Struct("<QQ%di" % len(_STATE_FIELDS))
+_UNKNOWN = -2**31  # state value not yet recorded
+
+# code of each recorded field, codes must never change to keep old logs readable
+_FIELD_CODES = {"speed": 0, "battery": 1, "accelerator_state": 2, "break_state": 3, "horn_state": 4,
+                "charge_state": 5, "left_indicator_state": 6, "right_indicator_state": 7, "left_indicator_toggle": 8,
+                "right_indicator_toggle": 9, "speedometer_range": 10, "speedometer_resetter_state": 11}
+_FIELD_NAMES = {code: field for field, code in _FIELD_CODES.items()}
+
+
+class Recorder():
+    """Record state changes into a log file, give this to TriggerAction.set_recorder() \n
+    note: a seek index entry with the complete state is written once every index_interval \
+    seconds of recording"""
+    def __init__(self, log_file: str, index_interval: float = 1.0):
+        self.__log = open(log_file, "wb")
+        self.__log.write(_MAGIC)
+        self.__index = open(log_file + ".idx", "wb")
+        self.__lock = threading.Lock()
+        self.index_interval_ns = round(index_interval*1e9)
+        self.start_ns = time.monotonic_ns()
+        self.next_index_ns = 0
+        self.state = dict.fromkeys(_STATE_FIELDS, _UNKNOWN)
+        self.state["left_indicator_state"] = self.state["right_indicator_state"] = 0  # toggles start from off
+
+    def record(self, field: str, val):
+        timestamp_ns = time.monotonic_ns() - self.start_ns
+        code = _FIELD_CODES[field]
+        val = round(val)
+        with self.__lock:
+            if self.__log.closed:
+                return
+            if timestamp_ns >= self.next_index_ns:
+                self.__index.write(_INDEX_ENTRY.pack(timestamp_ns, self.__log.tell(), *self.state.values()))
+                self.next_index_ns = timestamp_ns + self.index_interval_ns
+            self.__log.write(_ENTRY.pack(timestamp_ns, code, val))
+
+            # keeping complete state for next index entry
+            if field == "left_indicator_toggle" or field == "right_indicator_toggle":
+                field = field.replace("toggle", "state")
+                val = not self.state[field]
+            self.state[field] = int(val)
+
+    def flush(self):
+        with self.__lock:
+            self.__log.flush()
+            self.__index.flush()
+
+    def close(self):
+        with self.__lock:
+            self.__log.close()
+            self.__index.close()
+
+
+class Player():
+    """Replay a log file written by Recorder into a TriggerAction \n
+    note: speed is the playback speed factor from 0.1 to 100, pass None to play as fast as possible"""
+    def __init__(self, log_file: str, trigger_action, speed: float = 1.0):
+        if speed is not None and not 0.1 <= speed <= 100:
+            raise ValueError("speed should be between 0.1 to 100 or None")
+        self.trigger_action = trigger_action
+        self.speed = speed
+
+        with open(log_file, "rb") as log:
+            self.__log = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__log[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{log_file} is not a dashboard log file")
+        self.entry_count = (len(self.__log)-len(_MAGIC)) // _ENTRY.size
+        with open(log_file + ".idx", "rb") as index:
+            index_size = index.seek(0, 2)
+            self.__index = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ) if index_size else b""
+        self.index_count = len(self.__index) // _INDEX_ENTRY.size
+
+        self.position = 0  # next entry
+        self.__thread = None
+        self.__stopping = threading.Event()
+
+        # field -> function applying it on trigger_action
+        self.__appliers = {
+            "speed": trigger_action.set_speed,
+            "battery": trigger_action.update_battery_power,
+            "accelerator_state": lambda val: trigger_action.apply_accelerator() if val else trigger_action.release_accelerator(),
+            "break_state": lambda val: trigger_action.apply_break() if val else trigger_action.release_break(),
+            "horn_state": lambda val: trigger_action.sound_horn() if val else trigger_action.off_horn(),
+            "charge_state": lambda val: trigger_action.charging_on() if val else trigger_action.charging_off(),
+            "left_indicator_state": lambda val: trigger_action.update_state(left_indicator_state=bool(val)),
+            "right_indicator_state": lambda val: trigger_action.update_state(right_indicator_state=bool(val)),
+            "left_indicator_toggle": lambda val: trigger_action.left_indicator_on_or_off(),
+            "right_indicator_toggle": lambda val: trigger_action.right_indicator_on_or_off(),
+            "speedometer_range": trigger_action.set_speedometer_range,
+            "speedometer_resetter_state": lambda val: trigger_action.set_speedometer_resetter_state(bool(val)),
+        }
+
+    def entry(self, position: int) -> tuple:
+        """Returns (timestamp in seconds, field, value) of an entry"""
+        timestamp_ns, code, val = _ENTRY.unpack_from(self.__log, len(_MAGIC)+position*_ENTRY.size)
+        return timestamp_ns/1e9, _FIELD_NAMES[code], val
+
+    def duration(self) -> float:
+        """Recorded time in seconds"""
+        return self.entry(self.entry_count-1)[0] if self.entry_count else 0.0
+
+    def seek(self, seconds: float):
+        """Move to given time of the recording and apply the state at that time"""
+        # nearest index entry at or before given time
+        timestamps = _IndexTimestamps(self.__index, self.index_count)
+        index_position = bisect.bisect_right(timestamps, round(seconds*1e9)) - 1
+        if index_position < 0:
+            self.position = 0
+        else:
+            _, offset, *state = _INDEX_ENTRY.unpack_from(self.__index, index_position*_INDEX_ENTRY.size)
+            self.position = (offset-len(_MAGIC)) // _ENTRY.size
+            for field, val in zip(_STATE_FIELDS, state):
+                if val != _UNKNOWN: self.__appliers[field](val)
+
+        # applying remaining entries up to given time
+        while self.position < self.entry_count:
+            timestamp, field, val = self.entry(self.position)
+            if timestamp >= seconds:
+                break
+            self.__appliers[field](val)
+            self.position += 1
+
+    def play(self):
+        """Play from current position until end of log or stop(), this blocks until then"""
+        self.__stopping.clear()
+        if self.position >= self.entry_count:
+            return
+        first_timestamp = self.entry(self.position)[0]
+        start = time.monotonic()
+        while self.position < self.entry_count and not self.__stopping.is_set():
+            timestamp, field, val = self.entry(self.position)
+            if self.speed is not None:
+                wait = (timestamp-first_timestamp)/self.speed - (time.monotonic()-start)
+                if wait > 0 and self.__stopping.wait(wait):
+                    break
+            self.__appliers[field](val)
+            self.position += 1
+
+    def start(self):
+        """Play in a background thread"""
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stopping.clear()
+        self.__thread = threading.Thread(target=self.play, name="dashboard-player", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Pause playing, call start() or play() again to continue"""
+        self.__stopping.set()
+        if self.__thread is not None and self.__thread is not threading.current_thread():
+            self.__thread.join()
+
+    def join(self, timeout: float = None):
+        """Wait until playing in background thread finished"""
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def close(self):
+        self.stop()
+        self.__log.close()
+        if self.index_count:
+            self.__index.close()
+
+
+class _IndexTimestamps():
+    """Sequence view of index entry timestamps for bisect, without reading the whole index"""
+    def __init__(self, index, count: int):
+        self.index = index
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position: int) -> int:
+        return struct.unpack_from("<Q", self.index, position*_INDEX_ENTRY.size)[0]
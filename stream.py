@@ -0,0 +1,213 @@
+"""This module provide FrameStreamServer, which stream the rendered frames of a dashboard (or any \
+widget e.g. FleetWall) to remote viewers over TCP, see stream_viewer.py for the protocol and a \
+reference viewer \n
+    A frame is rendered in the GUI thread only after the widget painted something, then each \
+    viewer thread diffs it against the frame its viewer already has in fixed size tiles and \
+    sends only the changed tiles, zlib compressed. A viewer which is still receiving a frame \
+    (slow link or slow viewer) gets only the newest frame after it, so the frame rate of each \
+    viewer follows its own backpressure. \n
+Example: \n
+    dashboard = DashBoard()
+    dashboard.show_dashboard()
+    server = FrameStreamServer(dashboard, 5900, host="0.0.0.0")
+    server.start()
+note: this module needs numpy
+"""
+
+import socket
+import threading
+import zlib
+
+import numpy as np
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+
+from stream_viewer import _FRAME_HEADER, _MAGIC, _TILE_HEADER
+
+
+class FrameStreamServer():
+    """Stream frames of widget to viewers connecting on a TCP port, at most max_fps frames per \
+    second \n note: create and start it in the GUI thread. tile_size is the side of the diffed tiles \
+    in pixels and compress_level the zlib level (1 fastest to 9 smallest)"""
+    def __init__(self, widget: QWidget, port: int, host: str = "127.0.0.1", tile_size: int = 64,
+                 max_fps: float = 30, compress_level: int = 1):
+        self.widget = widget
+        self.address = (host, port)
+        self.tile_size = tile_size
+        self.compress_level = compress_level
+        self.__lock = threading.Lock()
+        self.__running = threading.Event()
+        self.__viewers = []
+        self.__socket = None
+        self.__thread = None
+        self.frame_number = 0
+
+        self.rendered_frames = 0
+        self.sent_frames = 0
+        self.skipped_frames = 0  # replaced by a newer frame before a busy viewer took them
+        self.sent_tiles = 0
+        self.sent_bytes = 0
+
+        # frames are rendered only after the widget (or its child widgets) painted
+        self.__paint_watcher = _PaintWatcher(widget)
+        self.__frame_timer = QTimer(widget)
+        self.__frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.__frame_timer.setInterval(round(1000/max_fps))
+        self.__frame_timer.timeout.connect(self.__render_frame)
+
+    def start(self):
+        if self.__running.is_set():
+            return
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__socket.bind(self.address)
+        self.__socket.listen()
+        self.__socket.settimeout(0.2)  # to notice stop()
+        self.address = self.__socket.getsockname()  # actual port when port 0 is given
+        self.__running.set()
+        self.__thread = threading.Thread(target=self.__accept_loop, name="frame-stream", daemon=True)
+        self.__thread.start()
+        self.__paint_watcher.dirty = True
+        self.__frame_timer.start()
+
+    def stop(self):
+        if not self.__running.is_set():
+            return
+        self.__running.clear()
+        self.__frame_timer.stop()
+        self.__thread.join()
+        self.__socket.close()
+        with self.__lock:
+            viewers, self.__viewers = self.__viewers, []
+        for viewer in viewers:
+            viewer.close()
+            viewer.thread.join()
+
+    def counters(self) -> dict:
+        """Connected viewers, rendered, sent and skipped frames, sent tiles and bytes"""
+        with self.__lock:
+            return {"viewers": len(self.__viewers), "rendered_frames": self.rendered_frames, "sent_frames": self.sent_frames,
+                    "skipped_frames": self.skipped_frames, "sent_tiles": self.sent_tiles, "sent_bytes": self.sent_bytes}
+
+    def __accept_loop(self):
+        while self.__running.is_set():
+            try:
+                connection, _ = self.__socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            viewer = _Viewer(connection, self.__lock)
+            viewer.thread = threading.Thread(target=self.__send_loop, args=(viewer,), name="frame-stream-viewer", daemon=True)
+            with self.__lock:
+                self.__viewers.append(viewer)
+            self.__paint_watcher.dirty = True  # first frame of new viewer, even if nothing changed
+            viewer.thread.start()
+
+    def __render_frame(self):
+        # GUI thread, rendering is skipped while nothing changed or every viewer is still sending
+        with self.__lock:
+            viewers = [viewer for viewer in self.__viewers if viewer.pending is None]
+        if not self.__paint_watcher.dirty or not viewers:
+            return
+        image = QImage(self.widget.size(), QImage.Format.Format_RGBA8888_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        self.__paint_watcher.rendering = True
+        self.widget.render(image)
+        self.__paint_watcher.rendering = False
+        self.__paint_watcher.dirty = False
+
+        frame = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), np.uint32).reshape(image.height(), image.width())
+        self.frame_number += 1
+        with self.__lock:
+            self.rendered_frames += 1
+            for viewer in self.__viewers:
+                if viewer.pending is not None:
+                    self.skipped_frames += 1
+                viewer.pending = (self.frame_number, frame)
+                viewer.frame_ready.notify()
+
+    def __send_loop(self, viewer):
+        shown = None  # frame the viewer has
+        try:
+            while self.__running.is_set():
+                with self.__lock:
+                    if viewer.pending is None and not viewer.frame_ready.wait(0.2):
+                        continue
+                    frame_number, frame = viewer.pending
+                message = self.frame_message(frame_number, frame, shown)
+                viewer.connection.sendall(message)  # blocks while the viewer is slow, that is the backpressure
+                shown = frame
+                with self.__lock:
+                    viewer.pending = None if viewer.pending[0] == frame_number else viewer.pending
+                    self.sent_frames += 1
+                    self.sent_bytes += len(message)
+        except OSError:  # viewer disconnected
+            pass
+        with self.__lock:
+            if viewer in self.__viewers:
+                self.__viewers.remove(viewer)
+        viewer.close()
+
+    def frame_message(self, frame_number: int, frame: np.ndarray, shown: np.ndarray = None) -> bytes:
+        """Frame header and every tile which differs from shown frame, every tile without it"""
+        tile_size = self.tile_size
+        height, width = frame.shape
+        rows, columns = -(-height//tile_size), -(-width//tile_size)
+        if shown is None or shown.shape != frame.shape:
+            changed = np.ones((rows, columns), bool)
+        else:
+            # any changed pixel marks its tile, pixels are padded to whole tiles
+            difference = np.zeros((rows*tile_size, columns*tile_size), bool)
+            difference[:height, :width] = frame != shown
+            changed = difference.reshape(rows, tile_size, columns, tile_size).any(axis=(1, 3))
+
+        parts = []
+        for row, column in np.argwhere(changed).tolist():
+            x, y = column*tile_size, row*tile_size
+            tile = frame[y:y+tile_size, x:x+tile_size]
+            data = zlib.compress(np.ascontiguousarray(tile).tobytes(), self.compress_level)
+            parts.append(_TILE_HEADER.pack(x, y, tile.shape[1], tile.shape[0], len(data)))
+            parts.append(data)
+        with self.__lock:
+            self.sent_tiles += len(parts)//2
+        return _FRAME_HEADER.pack(_MAGIC, frame_number, width, height, len(parts)//2) + b"".join(parts)
+
+
+class _Viewer():
+    """WARNING: This is a private class. do not import this."""
+    def __init__(self, connection, lock):
+        self.connection = connection
+        self.pending = None  # (frame number, frame) not yet sent by its thread
+        self.frame_ready = threading.Condition(lock)
+        self.thread = None
+
+    def close(self):
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connection.close()
+
+
+class _PaintWatcher(QObject):
+    """WARNING: This is a private class. do not import this."""
+    # marks paints of the watched widget and of its child widgets, also those added later
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.dirty = True
+        self.rendering = False  # paints of FrameStreamServer rendering are not changes
+        self.watch(widget)
+
+    def watch(self, widget):
+        for watched in (widget, *widget.findChildren(QWidget)):
+            watched.installEventFilter(self)
+
+    def eventFilter(self, source, event):
+        if event.type() == QEvent.Type.Paint and not self.rendering:
+            self.dirty = True
+        elif event.type() == QEvent.Type.ChildAdded and event.child().isWidgetType():
+            self.watch(event.child())
+        return False
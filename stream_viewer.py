@@ -0,0 +1,134 @@
+"""Reference viewer of dashboard frames streamed by stream.py, it needs only the Python standard \
+library (tkinter for the window), so it runs where Qt is not installed \n
+    A frame message is a _FRAME_HEADER followed by its tiles, each a _TILE_HEADER and the zlib \
+    compressed RGBA rows (premultiplied alpha) of the tile. The first frame sent to a viewer and \
+    frames after a resize carry every tile, later frames only the tiles which changed. \n
+Usage: \n
+    python stream_viewer.py --host 192.168.1.20 --port 5900
+    python stream_viewer.py --port 5900 --snapshot frame.ppm     (save one frame and exit)
+"""
+
+import argparse
+import socket
+import struct
+import threading
+import zlib
+
+_MAGIC = b"EVFS"
+# magic, frame number (uint32), width, height and tile count (uint16)
+_FRAME_HEADER = struct.Struct("<4sIHHH")
+# x, y, width and height of tile (uint16), length of compressed tile (uint32)
+_TILE_HEADER = struct.Struct("<HHHHI")
+
+
+class FrameStreamClient():
+    """Connect to a FrameStreamServer and keep the reassembled frame in pixels (RGBA rows)"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 5900):
+        self.__socket = socket.create_connection((host, port))
+        self.width = self.height = 0
+        self.pixels = bytearray()
+        self.frame_number = None
+        self.frames = 0
+        self.tiles = 0
+        self.received_bytes = 0
+
+    def __read(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.__socket.recv(size-len(data))
+            if not chunk:
+                raise ConnectionError("frame stream closed")
+            data += chunk
+        self.received_bytes += size
+        return bytes(data)
+
+    def read_frame(self) -> list:
+        """Wait for next frame and apply its tiles, returns changed rects as (x, y, width, height)"""
+        magic, self.frame_number, width, height, tile_count = _FRAME_HEADER.unpack(self.__read(_FRAME_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError("not a dashboard frame stream")
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.pixels = bytearray(width*height*4)
+
+        rects = []
+        for _ in range(tile_count):
+            x, y, tile_width, tile_height, length = _TILE_HEADER.unpack(self.__read(_TILE_HEADER.size))
+            tile = zlib.decompress(self.__read(length))
+            row_size = tile_width*4
+            for row in range(tile_height):
+                start = ((y+row)*width + x)*4
+                self.pixels[start:start+row_size] = tile[row*row_size:(row+1)*row_size]
+            rects.append((x, y, tile_width, tile_height))
+        self.frames += 1
+        self.tiles += tile_count
+        return rects
+
+    def ppm(self) -> bytes:
+        """Current frame as binary PPM, over black background"""
+        rgb = bytearray(self.width*self.height*3)
+        # premultiplied alpha, so dropping it is drawing over black
+        rgb[0::3] = self.pixels[0::4]
+        rgb[1::3] = self.pixels[1::4]
+        rgb[2::3] = self.pixels[2::4]
+        return b"P6 %d %d 255\n" % (self.width, self.height) + bytes(rgb)
+
+    def counters(self) -> dict:
+        """Received frames, tiles and bytes"""
+        return {"frames": self.frames, "tiles": self.tiles, "received_bytes": self.received_bytes}
+
+    def close(self):
+        self.__socket.close()
+
+
+def view(host: str, port: int):
+    """Show the stream in a tkinter window until it is closed"""
+    import tkinter
+
+    client = FrameStreamClient(host, port)
+    latest = []  # newest frame as ppm, frames are read in a background thread
+    lock = threading.Lock()
+
+    def read_loop():
+        try:
+            while True:
+                client.read_frame()
+                ppm = client.ppm()
+                with lock:
+                    latest[:] = [ppm]
+        except (ConnectionError, OSError):
+            pass
+
+    root = tkinter.Tk()
+    root.title(f"Dashboard stream {host}:{port}")
+    image = tkinter.PhotoImage()
+    tkinter.Label(root, image=image, background="black", borderwidth=0).pack()
+
+    def show_latest():
+        with lock:
+            ppm = latest.pop() if latest else None
+        if ppm is not None:
+            image.configure(data=ppm, format="PPM")
+        root.after(16, show_latest)
+
+    threading.Thread(target=read_loop, name="stream-viewer", daemon=True).start()
+    show_latest()
+    root.mainloop()
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard frame stream viewer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5900)
+    parser.add_argument("--snapshot", help="save first frame as ppm file instead of showing a window")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        client = FrameStreamClient(args.host, args.port)
+        client.read_frame()
+        with open(args.snapshot, "wb") as file:
+            file.write(client.ppm())
+        client.close()
+    else:
+        view(args.host, args.port)
@@ -0,0 +1,343 @@
+"""This module provide telemetry input channels to drive the dashboard from outside \
+of the process \n
+    1) UDP binary telemetry. A fixed layout datagram of sequence number, timestamp, speed, \
+       battery and a flags bitfield (see _PACKET) is decoded in a background thread and the \
+       newest sample is applied through TriggerAction.update_state(). \n
+    2) CAN frames decoded with a signal definition file (see CanDecoder), from a live \
+       SocketCAN like iterator or a candump log file. \n
+Example: \n
+    trigger_action = TriggerAction()
+    receiver = UdpTelemetryReceiver(trigger_action, 5005)
+    receiver.start()
+    trigger_action.launch_dashboard()
+"""
+
+import math
+import re
+import socket
+import struct
+import threading
+import time
+import traceback
+
+# sequence number (uint32), timestamp in microseconds (uint64), speed in km/h (float32),
+# battery in percentage (uint8), flags bitfield (uint8)
+_PACKET = struct.Struct("<IQfBB")
+
+# flags bitfield
+BREAK_FLAG = 1
+ACCELERATOR_FLAG = 2
+HORN_FLAG = 4
+LEFT_INDICATOR_FLAG = 8
+RIGHT_INDICATOR_FLAG = 16
+CHARGING_FLAG = 32
+
+_SEQUENCE_MASK = 0xFFFFFFFF
+_TOP_SPEED = 400  # km/h, top of the largest speedometer range
+# valid range of decoded values, as checked by telemetry_state(), other fields take any value
+_FIELD_RANGES = {"speed": (0, _TOP_SPEED), "battery": (0, 100)}
+
+# dashboard fields which can be mapped to CAN signals, bool fields are on for any non zero value
+_CAN_FIELDS = {"speed": round, "battery": round, "break_state": bool, "accelerator_state": bool, "horn_state": bool,
+                "left_indicator_state": bool, "right_indicator_state": bool, "charge_state": bool}
+
+# candump -l line of a classic data frame of 1 to 8 bytes (e.g.) "(1436509052.249713) can0 123#11223344AABBCCDD",
+# remote frames ("123#R") and CAN FD frames ("123##1...") do not match
+_CANDUMP_LINE = re.compile(r"\((\d+\.\d+)\)\s+\S+\s+([0-9A-Fa-f]+)#((?:[0-9A-Fa-f]{2}){1,8})\s*$")
+
+
+def pack_telemetry(sequence: int, timestamp_us: int, speed: float, battery: int, flags: int) -> bytes:
+    """Build one telemetry datagram"""
+    return _PACKET.pack(sequence & _SEQUENCE_MASK, timestamp_us, speed, battery, flags)
+
+
+def unpack_telemetry(datagram: bytes) -> tuple:
+    """Returns (sequence, timestamp_us, speed, battery, flags), raise struct.error for wrong size"""
+    return _PACKET.unpack(datagram)
+
+
+def telemetry_state(speed: float, battery: int, flags: int) -> dict:
+    """Convert decoded datagram fields to TriggerAction.update_state() keyword arguments, raise \
+    ValueError for speed which is not finite or not in 0 to 400 km/h and battery above 100"""
+    if not (math.isfinite(speed) and 0 <= speed <= _TOP_SPEED):
+        raise ValueError(f"speed {speed} out of range")
+    if not 0 <= battery <= 100:
+        raise ValueError(f"battery {battery} out of range")
+    return {"speed": round(speed), "battery": battery, "break_state": bool(flags & BREAK_FLAG),
+            "accelerator_state": bool(flags & ACCELERATOR_FLAG), "horn_state": bool(flags & HORN_FLAG),
+            "left_indicator_state": bool(flags & LEFT_INDICATOR_FLAG),
+            "right_indicator_state": bool(flags & RIGHT_INDICATOR_FLAG), "charge_state": bool(flags & CHARGING_FLAG)}
+
+
+class UdpTelemetryReceiver():
+    """Receive telemetry datagrams on a local UDP port and apply them to the dashboard \n
+    note: duplicate and out of order datagrams are dropped by sequence number. While \
+    the dashboard has not yet drawn the last sample, newer samples replace it, so only \
+    the newest sample per frame reaches the GUI thread"""
+    def __init__(self, trigger_action, port: int, host: str = "127.0.0.1"):
+        self.trigger_action = trigger_action
+        self.address = (host, port)
+
+        self.received = 0  # valid datagrams
+        self.dropped = 0  # duplicate or out of order datagrams
+        self.lost = 0  # datagrams missing between received sequence numbers
+        self.malformed = 0  # datagrams of wrong size or with out of range values
+        self.errors = 0  # datagrams whose applying raised an error, the thread keeps reading
+        self.last_sequence = None
+        self.last_timestamp_us = None
+
+        self.__socket = None
+        self.__thread = None
+        self.__running = threading.Event()
+
+    def start(self):
+        """Bind the port and start reading in a background thread"""
+        if self.__thread is not None:
+            return
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.__socket.bind(self.address)
+        self.__socket.settimeout(0.2)  # to notice stop()
+        self.address = self.__socket.getsockname()  # actual port when port 0 is given
+        self.__running.set()
+        self.__thread = threading.Thread(target=self.__read_loop, name="udp-telemetry", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop reading and close the port"""
+        if self.__thread is None:
+            return
+        self.__running.clear()
+        self.__thread.join()
+        self.__socket.close()
+        self.__thread = None
+
+    def counters(self) -> dict:
+        """Received, dropped, lost, malformed and failed datagram counts"""
+        return {"received": self.received, "dropped": self.dropped, "lost": self.lost, "malformed": self.malformed,
+                "errors": self.errors}
+
+    def accept_sequence(self, sequence: int) -> bool:
+        """Check sequence number against the last accepted one and count lost datagrams"""
+        if self.last_sequence is not None:
+            step = (sequence - self.last_sequence) & _SEQUENCE_MASK
+            if step == 0 or step > _SEQUENCE_MASK >> 1:  # duplicate or older (wrap around safe)
+                self.dropped += 1
+                return False
+            self.lost += step - 1
+        self.last_sequence = sequence
+        return True
+
+    def __read_loop(self):
+        while self.__running.is_set():
+            try:
+                datagram = self.__socket.recv(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                self.apply_datagram(datagram)
+            except Exception:  # one bad datagram must not stop the ingestion
+                self.errors += 1
+                traceback.print_exc()
+
+    def apply_datagram(self, datagram: bytes):
+        """Decode one datagram and apply it, wrong size and out of range datagrams are counted as malformed"""
+        try:
+            sequence, timestamp_us, speed, battery, flags = unpack_telemetry(datagram)
+            state = telemetry_state(speed, battery, flags)
+        except (struct.error, ValueError):
+            self.malformed += 1
+            return
+        if not self.accept_sequence(sequence):
+            return
+        self.received += 1
+        self.last_timestamp_us = timestamp_us
+        self.trigger_action.update_state(**state)
+
+
+class UdpTelemetrySender():
+    """Send telemetry datagrams to a UdpTelemetryReceiver, sequence number and timestamp are filled in"""
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self.address = (host, port)
+        self.sequence = 0
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, speed: float, battery: int, flags: int = 0):
+        self.__socket.sendto(pack_telemetry(self.sequence, time.monotonic_ns()//1000, speed, battery, flags), self.address)
+        self.sequence = (self.sequence + 1) & _SEQUENCE_MASK
+
+    def close(self):
+        self.__socket.close()
+
+
+class CanDecoder():
+    """Decode CAN frames to dashboard fields with a signal definition file. Each line of the \
+    file define one signal as \n
+        <message id> <start bit> <length> <scale> <offset> <field> \n
+    (e.g.) "0x1F0 0 16 0.01 0 speed". Message id is hex with 0x prefix or decimal, signals are \
+    unsigned little endian (intel) and value = raw*scale+offset. Field is one of speed, battery, \
+    break_state, accelerator_state, horn_state, left_indicator_state, right_indicator_state and \
+    charge_state. Empty lines and lines starting with '#' are skipped. A signal is not decoded \
+    from a frame whose data is too short to hold its bits. Speed out of 0 to 400 km/h and \
+    battery out of 0 to 100 are out of range, as for UDP telemetry."""
+    def __init__(self, signal_file: str):
+        # message id -> ((shift, mask, scale, offset, field, convert, data length needed, low, high), ...)
+        self.signals = {}
+        self.malformed = 0  # frames skipped by decode_frames() for out of range values
+        with open(signal_file) as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    message_id, start, length, scale, offset, field = line.split()
+                    message_id, start, length = int(message_id, 0), int(start), int(length)
+                    scale, offset = float(scale), float(offset)
+                except ValueError:
+                    raise ValueError(f"{signal_file}:{line_number}: expected '<message id> <start bit> <length> <scale> <offset> <field>'")
+                if field not in _CAN_FIELDS:
+                    raise ValueError(f"{signal_file}:{line_number}: unknown field '{field}'")
+                if start < 0 or length < 1 or start+length > 64:
+                    raise ValueError(f"{signal_file}:{line_number}: signal does not fit in 64 bit payload")
+                self.signals.setdefault(message_id, [])
+                low, high = _FIELD_RANGES.get(field, (-math.inf, math.inf))
+                self.signals[message_id].append((start, (1 << length)-1, scale, offset, field, _CAN_FIELDS[field], -(-(start+length)//8),
+                                                 low, high))
+        self.signals = {message_id: tuple(signals) for message_id, signals in self.signals.items()}
+
+    def decode(self, arbitration_id: int, data: bytes) -> dict:
+        """Returns decoded fields of one frame, empty dict for ids without signals, raise \
+        ValueError for out of range values"""
+        signals = self.signals.get(arbitration_id)
+        if signals is None:
+            return {}
+        raw = int.from_bytes(data, "little")
+        state = {}
+        for shift, mask, scale, offset, field, convert, size, low, high in signals:
+            if len(data) >= size:
+                val = (raw >> shift & mask)*scale+offset
+                if not low <= val <= high:  # also false for nan
+                    raise ValueError(f"{field} {val} out of range")
+                state[field] = convert(val)
+        return state
+
+    def decode_frames(self, frames) -> dict:
+        """Decode many (arbitration_id, data) frames and returns the latest value of each field, \
+        frames with an out of range value are skipped and counted in malformed"""
+        state = {}
+        signals_of = self.signals.get
+        for arbitration_id, data in frames:
+            signals = signals_of(arbitration_id)
+            if signals is None:
+                continue
+            raw = int.from_bytes(data, "little")
+            frame_state = {}
+            for shift, mask, scale, offset, field, convert, size, low, high in signals:
+                if len(data) >= size:
+                    val = frame_state[field] = (raw >> shift & mask)*scale+offset
+                    if not low <= val <= high:  # also false for nan
+                        self.malformed += 1
+                        break
+            else:
+                state.update(frame_state)
+        return {field: _CAN_FIELDS[field](val) for field, val in state.items()}
+
+
+def read_candump_log(log_file: str):
+    """Yield (timestamp, arbitration_id, data) of each frame in a 'candump -l' log file"""
+    with open(log_file) as file:
+        for line in file:
+            match = _CANDUMP_LINE.match(line)
+            if match:
+                yield float(match.group(1)), int(match.group(2), 16), bytes.fromhex(match.group(3))
+
+
+def candump_frames(log_file: str):
+    """Yield (arbitration_id, data) of each frame in a 'candump -l' log file"""
+    for _, arbitration_id, data in read_candump_log(log_file):
+        yield arbitration_id, data
+
+
+class CanTelemetryReader():
+    """Decode frames from a CAN frame iterator in a background thread and apply them to the \
+    dashboard \n
+    note: frames can be (arbitration_id, data) tuples or SocketCAN like message objects with \
+    arbitration_id and data attributes (e.g.) iter(can.interface.Bus(...)). Frames of ids without \
+    signals, remote frames and error frames are skipped. Frames are decoded with decode_frames() \
+    in batches of batch_size frames with signals and the latest value of each field is applied \
+    once per batch, give a larger batch_size (e.g. 256) for log files, 1 for a live bus. Frames \
+    with out of range values are counted as malformed, a batch raising an error is counted and \
+    reported and reading goes on"""
+    def __init__(self, trigger_action, decoder: CanDecoder, frames, batch_size: int = 1):
+        self.trigger_action = trigger_action
+        self.decoder = decoder
+        self.frames = frames
+        self.batch_size = max(batch_size, 1)
+
+        self.received = 0  # all frames
+        self.decoded = 0  # frames with dashboard signals
+        self.malformed = 0  # frames with dashboard signals skipped for out of range values
+        self.errors = 0  # batches whose decoding or applying raised an error, the thread keeps reading
+
+        self.__thread = None
+        self.__running = threading.Event()
+
+    def start(self):
+        """Start reading frames in a background thread"""
+        if self.__thread is not None:
+            return
+        self.__running.set()
+        self.__thread = threading.Thread(target=self.__read_loop, name="can-telemetry", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop reading after the current frame"""
+        self.__running.clear()
+
+    def join(self, timeout: float = None):
+        """Wait until all frames are read, useful for log file replay"""
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def counters(self) -> dict:
+        """Received, decoded and malformed frame counts and failed batch count"""
+        return {"received": self.received, "decoded": self.decoded, "malformed": self.malformed, "errors": self.errors}
+
+    def __read_loop(self):
+        signals = self.decoder.signals
+        batch = []
+        try:
+            for frame in self.frames:
+                if not self.__running.is_set():
+                    break
+                self.received += 1
+                if isinstance(frame, tuple):
+                    arbitration_id, data = frame
+                elif getattr(frame, "is_remote_frame", False) or getattr(frame, "is_error_frame", False):
+                    continue
+                else:
+                    arbitration_id, data = frame.arbitration_id, frame.data
+                if arbitration_id in signals:
+                    batch.append((arbitration_id, data))
+                    if len(batch) >= self.batch_size:
+                        self.__apply(batch)
+                        batch = []
+        except Exception:  # frame iterator failed, frames read until then are still applied
+            self.errors += 1
+            traceback.print_exc()
+        if batch:
+            self.__apply(batch)
+
+    def __apply(self, batch):
+        self.decoded += len(batch)
+        malformed = self.decoder.malformed
+        try:
+            state = self.decoder.decode_frames(batch)
+            if state:
+                self.trigger_action.update_state(**state)
+        except Exception:  # one bad batch must not stop the ingestion
+            self.errors += 1
+            traceback.print_exc()
+        self.malformed += self.decoder.malformed - malformed